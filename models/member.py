@@ -10,7 +10,7 @@ if TYPE_CHECKING:
 
 
 class Member(SQLModel, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid.uuid7, primary_key=True)
     created_at: datetime = Field(default=datetime.now(timezone.utc), nullable=False)
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
@@ -20,7 +20,7 @@ class Member(SQLModel, table=True):
         unique=True, index=True, max_length=500, nullable=False, min_length=5
     )
     member_group_id: uuid.UUID = Field(
-        index=True, foreign_key="member_group.id", nullable=False, min_length=1
+        index=True, foreign_key="member_group.id", nullable=False
     )
     requests: list["MemberRequest"] = Relationship(back_populates="member")
 
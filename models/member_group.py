@@ -24,7 +24,7 @@ class MemberGroupShift(SQLModel, table=True):
 class MemberGroup(SQLModel, table=True):
     __tablename__ = "member_group"
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid.uuid7, primary_key=True)
     created_at: datetime = Field(default=datetime.now(timezone.utc), nullable=False)
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
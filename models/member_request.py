@@ -11,7 +11,7 @@ if TYPE_CHECKING:
 class MemberRequest(SQLModel, table=True):
     __tablename__ = "member_request"
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid.uuid7, primary_key=True)
     created_at: datetime = Field(default=datetime.now(timezone.utc), nullable=False)
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
@@ -19,7 +19,5 @@ class MemberRequest(SQLModel, table=True):
     start_at: datetime = Field(nullable=False)
     end_at: datetime = Field(nullable=False)
     description: str = Field(default="", nullable=False)
-    member_id: uuid.UUID = Field(
-        index=True, foreign_key="member.id", nullable=False, min_length=1
-    )
+    member_id: uuid.UUID = Field(index=True, foreign_key="member.id", nullable=False)
     member: "Member" = Relationship(back_populates="requests")
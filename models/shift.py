@@ -10,9 +10,12 @@ from .member_group import MemberGroupShift
 if TYPE_CHECKING:
     from .member_group import MemberGroup
 
+# Weekday string -> its bit in a Shift.days_to_mask bitmask
+_DAY_BITS = {str(day): 1 << day for day in range(7)}
+
 
 class Shift(SQLModel, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid.uuid7, primary_key=True)
     created_at: datetime = Field(default=datetime.now(timezone.utc), nullable=False)
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
@@ -28,6 +31,20 @@ class Shift(SQLModel, table=True):
         back_populates="shifts", link_model=MemberGroupShift
     )
 
+    @staticmethod
+    def days_to_mask(days: list[str]) -> int:
+        """Pack weekday strings ("0".."6") into a bitmask."""
+        mask = 0
+        for day in days:
+            mask |= _DAY_BITS[day]
+        return mask
+
+    @validates("days")
+    def validate_days(self, _, days):
+        if days and not all(day in _DAY_BITS for day in days):
+            raise ValueError('days must only contain weekdays "0" to "6"')
+        return days
+
     @validates("duration_seconds")
     def validate_duration_seconds(self, _, duration_seconds):
         if not duration_seconds or duration_seconds <= 0:
@@ -1,6 +1,7 @@
 import uuid
 
-from sqlalchemy.orm import validates
+import numpy as np
+from sqlalchemy.orm import raiseload, validates
 from sqlmodel import Field, PrimaryKeyConstraint, SQLModel
 
 
@@ -96,7 +97,8 @@ class ShiftConstraint(SQLModel, table=True):
         Returns:
             Dictionary with counts: {"created": X, "updated": Y, "unchanged": Z}
         """
-        from sqlmodel import select
+        from sqlmodel import insert, select
+
         from .shift import Shift
 
         # Initialize counters
@@ -104,65 +106,49 @@ class ShiftConstraint(SQLModel, table=True):
         updated_count = 0
         unchanged_count = 0
 
-        # Fetch all shifts
-        shifts = session.exec(select(Shift)).all()
-
-        # Collect detected constraints: (shift_id, linked_shift_id, within_last_shifts)
-        detected_constraints: set[tuple] = set()
-
-        # Iterate through all unique pairs of shifts
-        for i, shift_a in enumerate(shifts):
-            for shift_b in shifts[i + 1 :]:
-                # Check for same-day overlaps
-                common_days = set(shift_a.days) & set(shift_b.days)
-
-                for _ in common_days:
-                    if cls._shifts_overlap_on_day(
-                        shift_a.seconds_since_midnight,
-                        shift_a.duration_seconds,
-                        shift_b.seconds_since_midnight,
-                        shift_b.duration_seconds,
-                    ):
-                        # Same-day overlap: bidirectional with within_last_shifts=0
-                        detected_constraints.add((shift_a.id, shift_b.id, 0))
-                        detected_constraints.add((shift_b.id, shift_a.id, 0))
-                        break  # Only need to detect once per pair
-
-                # Check for cross-day overlaps (shift A into shift B)
-                for day_a_str in shift_a.days:
-                    day_a = int(day_a_str)
-                    for day_b_str in shift_b.days:
-                        day_b = int(day_b_str)
-
-                        crosses, overlaps = cls._check_cross_day_overlap(
-                            shift_a.seconds_since_midnight,
-                            shift_a.duration_seconds,
-                            shift_b.seconds_since_midnight,
-                            day_a,
-                            day_b,
-                        )
-
-                        if crosses and overlaps:
-                            # Cross-day overlap: unidirectional A -> B with within_last_shifts=1
-                            detected_constraints.add((shift_a.id, shift_b.id, 1))
-
-                # Check for cross-day overlaps (shift B into shift A)
-                for day_b_str in shift_b.days:
-                    day_b = int(day_b_str)
-                    for day_a_str in shift_a.days:
-                        day_a = int(day_a_str)
-
-                        crosses, overlaps = cls._check_cross_day_overlap(
-                            shift_b.seconds_since_midnight,
-                            shift_b.duration_seconds,
-                            shift_a.seconds_since_midnight,
-                            day_b,
-                            day_a,
-                        )
-
-                        if crosses and overlaps:
-                            # Cross-day overlap: unidirectional B -> A with within_last_shifts=1
-                            detected_constraints.add((shift_b.id, shift_a.id, 1))
+        # Fetch all shifts; only their columns are used, so any relationship
+        # access would be an accidental per-shift lazy load
+        shifts = session.exec(select(Shift).options(raiseload("*"))).all()
+
+        # Pairwise overlap matrices for all shifts at once: entry [a, b] relates
+        # shift a to shift b
+        starts = np.array(
+            [shift.seconds_since_midnight for shift in shifts], dtype=np.int64
+        )
+        ends = starts + np.array(
+            [shift.duration_seconds for shift in shifts], dtype=np.int64
+        )
+        # Built from days, the source of truth, so rows written without the
+        # ORM hooks still get their overlaps detected
+        day_masks = np.array(
+            [Shift.days_to_mask(shift.days or []) for shift in shifts], dtype=np.int64
+        )
+        # Weekdays following each shift's days, wrapping day 6 back to day 0
+        next_day_masks = ((day_masks << 1) | (day_masks >> 6)) & 0x7F
+
+        # Same-day overlap: a common weekday and intersecting time ranges
+        same_day = ((day_masks[:, None] & day_masks[None, :]) != 0) & (
+            np.maximum(starts[:, None], starts[None, :])
+            < np.minimum(ends[:, None], ends[None, :])
+        )
+        # Cross-day overlap: shift a spills past midnight into shift b on the
+        # following weekday
+        cross_day = (
+            (ends[:, None] > 86400)
+            & ((next_day_masks[:, None] & day_masks[None, :]) != 0)
+            & (starts[None, :] < ends[:, None] - 86400)
+        )
+
+        # within_last_shifts per ordered pair, -1 meaning no constraint. Same-day
+        # overlaps are bidirectional with 0, cross-day ones unidirectional with 1;
+        # a pair overlapping both ways keeps the stricter cross-day value.
+        within = np.where(cross_day, 1, np.where(same_day, 0, -1))
+        np.fill_diagonal(within, -1)
+
+        detected_constraints: dict[tuple, int] = {
+            (shifts[a].id, shifts[b].id): int(within[a, b])
+            for a, b in zip(*np.nonzero(within >= 0))
+        }
 
         # Fetch existing constraints
         existing_constraints = {}
@@ -170,9 +156,12 @@ class ShiftConstraint(SQLModel, table=True):
             key = (constraint.shift_id, constraint.linked_shift_id)
             existing_constraints[key] = constraint
 
+        # New rows are collected and inserted in one executemany
+        to_create: list[dict] = []
+
         # Process detected constraints
-        for shift_id, linked_shift_id, within_last in detected_constraints:
-            key = (shift_id, linked_shift_id)
+        for key, within_last in detected_constraints.items():
+            shift_id, linked_shift_id = key
 
             if key in existing_constraints:
                 existing = existing_constraints[key]
@@ -183,14 +172,17 @@ class ShiftConstraint(SQLModel, table=True):
                 else:
                     unchanged_count += 1
             else:
-                new_constraint = cls(
-                    shift_id=shift_id,
-                    linked_shift_id=linked_shift_id,
-                    within_last_shifts=within_last,
+                to_create.append(
+                    {
+                        "shift_id": shift_id,
+                        "linked_shift_id": linked_shift_id,
+                        "within_last_shifts": within_last,
+                    }
                 )
-                session.add(new_constraint)
                 created_count += 1
 
+        if to_create:
+            session.execute(insert(cls), to_create)
         session.commit()
 
         return {
@@ -1,7 +1,12 @@
 import uuid
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
-from sqlmodel import Field, PrimaryKeyConstraint, SQLModel
+from sqlmodel import Field, PrimaryKeyConstraint, Relationship, SQLModel
+
+if TYPE_CHECKING:
+    from .member import Member
+    from .shift import Shift
 
 
 class MemberShiftScheduled(SQLModel, table=True):
@@ -20,7 +25,7 @@ class MemberShiftScheduled(SQLModel, table=True):
 class ShiftScheduled(SQLModel, table=True):
     __tablename__ = "shift_scheduled"
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, nullable=False)
+    id: uuid.UUID = Field(default_factory=uuid.uuid7, primary_key=True, nullable=False)
     created_at: datetime = Field(default=datetime.now(timezone.utc), nullable=False)
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
@@ -28,6 +33,11 @@ class ShiftScheduled(SQLModel, table=True):
     start_at: datetime = Field(nullable=False)
     end_at: datetime = Field(nullable=False)
     description: str = Field(default="", nullable=False)
-    shift_id: uuid.UUID = Field(
-        index=True, foreign_key="shift.id", nullable=False, min_length=1
-    )
+    shift_id: uuid.UUID = Field(index=True, foreign_key="shift.id", nullable=False)
+
+    # One-way navigation so a schedule can eager-load its template shift and
+    # assigned members (selectinload) instead of querying per row. Neither
+    # Shift nor Member needs the reverse collection, so there is no
+    # back_populates and loading those models never touches shift_scheduled.
+    shift: "Shift" = Relationship()
+    members: list["Member"] = Relationship(link_model=MemberShiftScheduled)
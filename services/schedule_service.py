@@ -1,8 +1,12 @@
 import math
+import os
 import uuid
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import numpy as np
 from ortools.sat.python import cp_model
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
@@ -21,8 +25,34 @@ from models import (
 MAX_HOURS_IN_3_DAYS = 32
 MAX_DAYS_IN_A_ROW = 3
 
+# CP-SAT parameters applied to both solve phases, overridable per call
+DEFAULT_SOLVER_PARAMS = {
+    "linearization_level": 2,
+}
+# Extra parameters for phase 2, which is warm-started from the phase 1 hints
+PHASE_2_SOLVER_PARAMS = {
+    "max_time_in_seconds": 30.0,
+}
 
-def schedule_shifts(start: datetime, end: datetime):
+
+class _StopOnZeroObjective(cp_model.CpSolverSolutionCallback):
+    """Stop the search as soon as a solution reaches the objective lower bound of 0."""
+
+    def on_solution_callback(self) -> None:
+        if self.objective_value == 0:
+            self.stop_search()
+
+
+def schedule_shifts(start: datetime, end: datetime, solver_params: dict | None = None):
+    """
+    Build and solve the two-phase CP-SAT scheduling model.
+
+    Args:
+        start: First day of the scheduling window (inclusive)
+        end: Last day of the scheduling window (exclusive)
+        solver_params: Optional CP-SAT parameter overrides (e.g.
+            {"num_workers": 8}), applied on top of the defaults for both phases
+    """
     with Session(engine) as session:
         members = session.exec(
             select(Member).options(selectinload(Member.requests))
@@ -42,55 +72,13 @@ def schedule_shifts(start: datetime, end: datetime):
         k: d for k, d in enumerate([start + timedelta(days=x) for x in range(num_days)])
     }
     all_days = range(num_days)
+    # Weekday of each scheduled day, in the same "0"-"6" form as Shift.days
+    day_weekdays = {k: str(d.weekday()) for k, d in days_dict.items()}
 
     # Build set of (member_key, day, shift_key) where time-off requests overlap shifts
-    request_overlaps: set[tuple[int, int, int]] = set()
-
-    for member_key, member in members_dict.items():
-        for request in member.requests:
-            # Clip request to scheduling window
-            effective_start = max(request.start_at, start)
-            effective_end = min(request.end_at, end)
-
-            # Skip if request is entirely outside window
-            if effective_start >= effective_end:
-                continue
-
-            # Iterate through all days in request range
-            current_date = effective_start.date()
-            end_date = effective_end.date()
-
-            while current_date <= end_date:
-                # Find day index in our scheduling window
-                day_key = None
-                for d_idx, d_date in days_dict.items():
-                    if d_date.date() == current_date:
-                        day_key = d_idx
-                        break
-
-                if day_key is not None and day_key in all_days:
-                    # Check each shift for overlap
-                    for shift_key, shift in shifts_dict.items():
-                        # Skip if shift doesn't occur on this weekday
-                        if str(current_date.weekday()) not in shift.days:
-                            continue
-
-                        # Build shift datetime range for this specific day (naive datetime)
-                        day_start = datetime.combine(current_date, datetime.min.time())
-                        shift_start = day_start + timedelta(
-                            seconds=shift.seconds_since_midnight
-                        )
-                        shift_end = shift_start + timedelta(
-                            seconds=shift.duration_seconds
-                        )
-
-                        # Check for any overlap using interval intersection
-                        if max(shift_start, effective_start) < min(
-                            shift_end, effective_end
-                        ):
-                            request_overlaps.add((member_key, day_key, shift_key))
-
-                current_date += timedelta(days=1)
+    request_overlaps = _find_request_overlaps(
+        members_dict, shifts_dict, days_dict, day_weekdays, start, end
+    )
 
     # Debug output to verify overlap detection
     print(f"\n🔍 Found {len(request_overlaps)} request-shift overlaps")
@@ -105,16 +93,17 @@ def schedule_shifts(start: datetime, end: datetime):
     model = cp_model.CpModel()
 
     shifts = {}
-    working_hours = {}
     days_worked = {}
     for m in all_members:
         for d in all_days:
             days_worked[(m, d)] = model.new_bool_var(f"day_worked_m{m}_d{d}")
             for s in all_shifts:
                 shifts[(m, d, s)] = model.new_bool_var(f"shift_m{m}_d{d}_s{s}")
-                working_hours[(m, d, s)] = model.new_int_var(
-                    0, 24, f"working_hours_m{m}_d{d}_s{s}"
-                )
+
+    # Hours worked per shift, used as coefficients on the shift booleans
+    shift_hours = [
+        math.ceil(shifts_dict[s].duration_seconds / 3600) for s in all_shifts
+    ]
 
     for d in all_days:
         for m in all_members:
@@ -125,30 +114,35 @@ def schedule_shifts(start: datetime, end: datetime):
     for d in range(num_days - MAX_DAYS_IN_A_ROW):
         for m in all_members:
             model.add(
-                sum(days_worked[(m, d + i)] for i in range(MAX_DAYS_IN_A_ROW + 1))
+                cp_model.LinearExpr.sum(
+                    [days_worked[(m, d + i)] for i in range(MAX_DAYS_IN_A_ROW + 1)]
+                )
                 <= MAX_DAYS_IN_A_ROW
             )
 
     for d in range(num_days - 1):
         for m in all_members:
             model.add(
-                sum(
-                    [
-                        working_hours[(m, d, s)] + working_hours[(m, d + 1, s)]
-                        for s in all_shifts
-                    ]
+                cp_model.LinearExpr.weighted_sum(
+                    [shifts[(m, d, s)] for s in all_shifts]
+                    + [shifts[(m, d + 1, s)] for s in all_shifts],
+                    shift_hours + shift_hours,
                 )
                 <= MAX_HOURS_IN_3_DAYS
             )
 
     for d in all_days:
         for s in all_shifts:
-            if str(days_dict[d].weekday()) in shifts_dict[s].days:
+            if day_weekdays[d] in shifts_dict[s].days:
                 model.add(
-                    sum(shifts[(m, d, s)] for m in all_members) == shift_requirements[s]
+                    cp_model.LinearExpr.sum([shifts[(m, d, s)] for m in all_members])
+                    == shift_requirements[s]
                 )
             else:
-                model.add(sum(shifts[(m, d, s)] for m in all_members) == 0)
+                model.add(
+                    cp_model.LinearExpr.sum([shifts[(m, d, s)] for m in all_members])
+                    == 0
+                )
 
     for m in all_members:
         for shift_constraint in shift_constraints:
@@ -190,22 +184,11 @@ def schedule_shifts(start: datetime, end: datetime):
             for s in all_shifts:
                 if m not in shift_eligibility[s]:
                     model.add(shifts[(m, d, s)] == 0)
-                    model.add(working_hours[(m, d, s)] == 0)
-                else:
-                    (
-                        model.add(
-                            working_hours[(m, d, s)]
-                            == math.ceil(shifts_dict[s].duration_seconds / 3600)
-                        ).only_enforce_if(shifts[(m, d, s)])
-                    )
-                    model.add(working_hours[(m, d, s)] == 0).only_enforce_if(
-                        shifts[(m, d, s)].Not()
-                    )
 
     # Soft fairness constraint: minimize the difference in shift counts
     # among members eligible for the same shift type
-    fairness_penalties = []
-    diffs = []
+    min_counts = []
+    max_counts = []
     for s in all_shifts:
         eligible_members = shift_eligibility[s]
         if len(eligible_members) > 1:
@@ -215,7 +198,7 @@ def schedule_shifts(start: datetime, end: datetime):
                 count_vars = []
                 for d in all_days:
                     count_vars.append(shifts[(m, d, s)])
-                member_shift_counts[m] = sum(count_vars)
+                member_shift_counts[m] = cp_model.LinearExpr.sum(count_vars)
 
             # Create variables for min and max shift counts among eligible members
             min_count = model.new_int_var(0, num_days, f"min_count_shift_{s}")
@@ -225,17 +208,19 @@ def schedule_shifts(start: datetime, end: datetime):
                 model.add(min_count <= member_shift_counts[m])
                 model.add(max_count >= member_shift_counts[m])
 
-            # Create penalty variable for the difference
-            diff = model.new_int_var(0, num_days, f"diff_shift_{s}")
-            diffs.append(diff)
-            model.add(diff == max_count - min_count)
-            fairness_penalties.append(diff)
+            min_counts.append(min_count)
+            max_counts.append(max_count)
 
-    # Minimize the total fairness penalty
-    model.minimize(sum(fairness_penalties))
+    # Minimize the total fairness penalty, i.e. the sum of max - min per shift
+    fairness_penalty = cp_model.LinearExpr.sum(max_counts) - cp_model.LinearExpr.sum(
+        min_counts
+    )
+    model.minimize(fairness_penalty)
 
+    params = {**DEFAULT_SOLVER_PARAMS, **(solver_params or {})}
     solver = cp_model.CpSolver()
-    solver.parameters.linearization_level = 1
+    for k, v in params.items():
+        setattr(solver.parameters, k, v)
 
     # Phase 1: Solve for minimizing fairness penalties
     status = solver.solve(model)
@@ -247,12 +232,12 @@ def schedule_shifts(start: datetime, end: datetime):
                 for s in all_shifts:
                     model.add_hint(shifts[(m, d, s)], solver.value(shifts[(m, d, s)]))
 
-        # Hint fairness penalty variables
-        for diff in diffs:
-            model.add_hint(diff, solver.value(diff))
+        # Hint fairness min/max count variables
+        for count in min_counts + max_counts:
+            model.add_hint(count, solver.value(count))
 
         # Lock in fairness objective as constraint
-        model.add(sum(fairness_penalties) <= round(solver.objective_value))
+        model.add(fairness_penalty <= round(solver.objective_value))
 
         # Phase 2: Minimize scheduling members during time-off requests
         # Use pre-computed overlap set for accurate time-of-day overlap detection
@@ -265,8 +250,10 @@ def schedule_shifts(start: datetime, end: datetime):
         print(
             f"\n📊 Phase 2: Minimizing {len(request_violations)} potential request violations"
         )
-        model.minimize(sum(request_violations))
-        status2 = solver.solve(model)
+        model.minimize(cp_model.LinearExpr.sum(request_violations))
+        for k, v in {**PHASE_2_SOLVER_PARAMS, **(solver_params or {})}.items():
+            setattr(solver.parameters, k, v)
+        status2 = solver.solve(model, _StopOnZeroObjective())
 
         if status2 == cp_model.OPTIMAL or status2 == cp_model.FEASIBLE:
             print("\n✓ Solution found!")
@@ -279,6 +266,100 @@ def schedule_shifts(start: datetime, end: datetime):
         return None, None, None, None, None
 
 
+def _find_request_overlaps(
+    members_dict: dict[int, Member],
+    shifts_dict: dict[int, Shift],
+    days_dict: dict[int, datetime],
+    day_weekdays: dict[int, str],
+    start: datetime,
+    end: datetime,
+) -> set[tuple[int, int, int]]:
+    """
+    Find (member_key, day_key, shift_key) triples where a member's time-off
+    request overlaps an occurrence of a shift within the scheduling window.
+
+    All instants are converted to integer seconds relative to ``start`` and
+    compared with a single broadcast over [request, day, shift].
+
+    Args:
+        members_dict: Members keyed by their model index (requests loaded)
+        shifts_dict: Shifts keyed by their model index
+        days_dict: Day start datetimes keyed by their model index
+        day_weekdays: Weekday string ("0"-"6") of each day, keyed like days_dict
+        start: Start of the scheduling window (inclusive)
+        end: End of the scheduling window (exclusive)
+
+    Returns:
+        Set of overlapping (member_key, day_key, shift_key) triples
+    """
+    one_second = timedelta(seconds=1)
+
+    request_members = []
+    request_starts = []
+    request_ends = []
+    for member_key, member in members_dict.items():
+        for request in member.requests:
+            # Clip request to scheduling window
+            effective_start = max(request.start_at, start)
+            effective_end = min(request.end_at, end)
+
+            # Skip if request is entirely outside window
+            if effective_start >= effective_end:
+                continue
+
+            request_members.append(member_key)
+            request_starts.append((effective_start - start) // one_second)
+            request_ends.append((effective_end - start) // one_second)
+
+    if not request_members or not days_dict or not shifts_dict:
+        return set()
+
+    # Shift occurrences per [day, shift], anchored at each day's midnight
+    day_midnights = np.array(
+        [
+            (datetime.combine(day.date(), datetime.min.time(), day.tzinfo) - start)
+            // one_second
+            for day in days_dict.values()
+        ],
+        dtype=np.int64,
+    )
+    shift_offsets = np.array(
+        [shift.seconds_since_midnight for shift in shifts_dict.values()],
+        dtype=np.int64,
+    )
+    shift_durations = np.array(
+        [shift.duration_seconds for shift in shifts_dict.values()], dtype=np.int64
+    )
+    shift_starts = day_midnights[:, None] + shift_offsets[None, :]
+    shift_ends = shift_starts + shift_durations[None, :]
+
+    # Only keep shifts that occur on that day's weekday
+    shift_days = [set(shift.days) for shift in shifts_dict.values()]
+    occurs = np.array(
+        [
+            [weekday in days for days in shift_days]
+            for weekday in (day_weekdays[day_key] for day_key in days_dict)
+        ],
+        dtype=bool,
+    )
+
+    request_starts = np.array(request_starts, dtype=np.int64)[:, None, None]
+    request_ends = np.array(request_ends, dtype=np.int64)[:, None, None]
+
+    # Interval intersection for every (request, day, shift) at once
+    overlap_mask = occurs[None, :, :] & (
+        np.maximum(request_starts, shift_starts[None, :, :])
+        < np.minimum(request_ends, shift_ends[None, :, :])
+    )
+
+    request_idx, day_idx, shift_idx = np.nonzero(overlap_mask)
+    member_keys = np.array(request_members)[request_idx]
+    day_keys = np.array(list(days_dict.keys()))[day_idx]
+    shift_keys = np.array(list(shifts_dict.keys()))[shift_idx]
+
+    return set(zip(member_keys.tolist(), day_keys.tolist(), shift_keys.tolist()))
+
+
 def save_schedule(
     solver,
     shifts,
@@ -350,48 +431,93 @@ def find_key_in_dict(obj_id: uuid.UUID, model_dict: dict[int, Member | Shift]) -
     raise ValueError("No such object")
 
 
-def _generate_ics_content(
-    events: list[tuple[ShiftScheduled, str, str]],
-) -> str:
+# Calendar header and footer are identical for every export
+_ICS_HEADER = (
+    b"BEGIN:VCALENDAR\r\n"
+    b"VERSION:2.0\r\n"
+    b"PRODID:-//Healthy Shifts//Schedule Export//EN\r\n"
+    b"CALSCALE:GREGORIAN\r\n"
+    b"METHOD:PUBLISH\r\n"
+)
+_ICS_FOOTER = b"END:VCALENDAR\r\n"
+
+# Upper bound on the bytes buffered before each write while exporting a calendar
+ICS_WRITE_CHUNK_SIZE = 1 << 20
+# Threads used to write the per-member files in export_all_members_ics
+ICS_EXPORT_MAX_WORKERS = 8
+
+
+def _ics_dtstamp() -> str:
+    """Return the current UTC time formatted as an ICS DTSTAMP value."""
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _generate_vevent(
+    shift: ShiftScheduled, uid_suffix: str, summary: str, dtstamp: str
+) -> bytes:
     """
-    Generate ICS calendar content from a list of events.
+    Generate an encoded VEVENT block for a single scheduled shift.
 
     Args:
-        events: List of tuples (shift, uid_suffix, summary)
-            - shift: ShiftScheduled instance
-            - uid_suffix: Unique identifier suffix for the event
-            - summary: Event summary/title
+        shift: ShiftScheduled instance
+        uid_suffix: Unique identifier suffix for the event
+        summary: Event summary/title
+        dtstamp: Pre-formatted DTSTAMP value shared by the whole export
 
     Returns:
-        ICS formatted calendar content as string
+        CRLF terminated VEVENT block as UTF-8 bytes
     """
-    ics_lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//Healthy Shifts//Schedule Export//EN",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-    ]
+    # Format as floating time (no timezone - displays in user's local timezone)
+    dtstart = shift.start_at.replace(tzinfo=None).strftime("%Y%m%dT%H%M%S")
+    dtend = shift.end_at.replace(tzinfo=None).strftime("%Y%m%dT%H%M%S")
+
+    return (
+        "BEGIN:VEVENT\r\n"
+        f"UID:{uid_suffix}@healthyshifts.local\r\n"
+        f"DTSTAMP:{dtstamp}\r\n"
+        f"DTSTART:{dtstart}\r\n"
+        f"DTEND:{dtend}\r\n"
+        f"SUMMARY:{summary}\r\n"
+        "END:VEVENT\r\n"
+    ).encode("utf-8")
+
+
+def _write_all(fd: int, data: bytes | bytearray) -> None:
+    """Write data to a file descriptor, retrying until partial writes complete."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _write_ics_file(ics_file: Path, vevents: Iterable[bytes]) -> None:
+    """
+    Write pre-rendered VEVENT blocks between the cached calendar header/footer.
 
-    for shift, uid_suffix, summary in events:
-        # Format as floating time (no timezone - displays in user's local timezone)
-        dtstart = shift.start_at.replace(tzinfo=None).strftime("%Y%m%dT%H%M%S")
-        dtend = shift.end_at.replace(tzinfo=None).strftime("%Y%m%dT%H%M%S")
-
-        ics_lines.extend(
-            [
-                "BEGIN:VEVENT",
-                f"UID:{uid_suffix}@healthyshifts.local",
-                f"DTSTAMP:{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}",
-                f"DTSTART:{dtstart}",
-                f"DTEND:{dtend}",
-                f"SUMMARY:{summary}",
-                "END:VEVENT",
-            ]
-        )
+    The calendar is already encoded with CRLF line endings, so it is written
+    straight to the file descriptor without going through Python's file objects.
+    Blocks are consumed lazily and coalesced into chunks of about
+    ICS_WRITE_CHUNK_SIZE bytes, so the writer itself never holds the whole
+    calendar; pass a generator to keep the rendered events out of memory too.
 
-    ics_lines.append("END:VCALENDAR")
-    return "\r\n".join(ics_lines) + "\r\n"
+    Args:
+        ics_file: Path of the ICS file to write
+        vevents: Encoded VEVENT blocks, in calendar order
+    """
+    # O_BINARY (Windows only) keeps CRLF line endings from being translated
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(ics_file, flags, 0o644)
+    try:
+        chunk = bytearray(_ICS_HEADER)
+        for vevent in vevents:
+            chunk += vevent
+            if len(chunk) >= ICS_WRITE_CHUNK_SIZE:
+                _write_all(fd, chunk)
+                chunk.clear()
+        chunk += _ICS_FOOTER
+        _write_all(fd, chunk)
+    finally:
+        os.close(fd)
 
 
 def export_member_ics(
@@ -429,21 +555,19 @@ def export_member_ics(
         .order_by(ShiftScheduled.start_at)
     )
 
-    shifts = session.exec(query).all()
-
-    # Prepare events for ICS generation
-    events = [(shift, str(shift.id), shift.description) for shift in shifts]
-
-    # Generate ICS content using shared helper
-    ics_content = _generate_ics_content(events)
+    # Render one VEVENT block per shift as the file is written, all stamped
+    # with the export time
+    dtstamp = _ics_dtstamp()
+    vevents = (
+        _generate_vevent(shift, str(shift.id), shift.description, dtstamp)
+        for shift in session.exec(query)
+    )
 
     # Write to file
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    ics_file = output_path / f"{member.email}.ics"
-    # Write in binary mode to ensure CRLF line endings are preserved across platforms
-    ics_file.write_bytes(ics_content.encode("utf-8"))
+    _write_ics_file(output_path / f"{member.email}.ics", vevents)
 
 
 def export_all_members_ics(
@@ -463,14 +587,10 @@ def export_all_members_ics(
         end: End date for filtering shifts (exclusive)
         output_dir: Directory to write the ICS files
     """
-    # Get all members
+    # Get all members, including those without shifts in the window
     members = session.exec(select(Member)).all()
 
-    # Export individual files for each member
-    for member in members:
-        export_member_ics(session, member.id, start, end, output_dir)
-
-    # Create global ICS file with all shifts for all members
+    # Fetch every member/shift assignment in the window with a single query
     query = (
         select(ShiftScheduled, Member)
         .join(
@@ -485,19 +605,44 @@ def export_all_members_ics(
 
     results = session.exec(query).all()
 
-    # Prepare events for ICS generation (global file with member names)
-    events = [
-        (shift, f"{shift.id}-{member.id}", f"{shift.description} - {member.name}")
-        for shift, member in results
-    ]
-
-    # Generate ICS content using shared helper
-    ics_content = _generate_ics_content(events)
+    # Group rows per member for the individual files, all stamped with the
+    # export time
+    dtstamp = _ics_dtstamp()
+    member_vevents: dict[uuid.UUID, list[bytes]] = {member.id: [] for member in members}
+    for shift, member in results:
+        member_vevents[member.id].append(
+            _generate_vevent(shift, str(shift.id), shift.description, dtstamp)
+        )
 
-    # Write global file
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    ics_file = output_path / "all_members.ics"
-    # Write in binary mode to ensure CRLF line endings are preserved across platforms
-    ics_file.write_bytes(ics_content.encode("utf-8"))
+    # Write individual files for each member; the writes are independent and
+    # os.write releases the GIL, so they can overlap across threads
+    if members:
+        with ThreadPoolExecutor(
+            max_workers=min(ICS_EXPORT_MAX_WORKERS, len(members))
+        ) as executor:
+            list(
+                executor.map(
+                    lambda member: _write_ics_file(
+                        output_path / f"{member.email}.ics", member_vevents[member.id]
+                    ),
+                    members,
+                )
+            )
+
+    # Write global file, rendering its events (with member names) from the
+    # same rows as they are written
+    _write_ics_file(
+        output_path / "all_members.ics",
+        (
+            _generate_vevent(
+                shift,
+                f"{shift.id}-{member.id}",
+                f"{shift.description} - {member.name}",
+                dtstamp,
+            )
+            for shift, member in results
+        ),
+    )
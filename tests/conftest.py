@@ -8,10 +8,12 @@ This module provides:
 """
 
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Generator
 
 import pytest
+from sqlalchemy import Engine, event
 from sqlmodel import Session, SQLModel, create_engine
 
 from models import (
@@ -25,30 +27,55 @@ from models import (
 )
 
 
-@pytest.fixture(scope="function")
-def test_engine():
+@pytest.fixture(scope="session")
+def test_engine() -> Generator[Engine, None, None]:
     """
-    Create an in-memory SQLite engine for each test.
-
-    Using scope="function" ensures each test gets a fresh database,
-    providing complete isolation between tests.
+    Create an in-memory SQLite engine shared by the whole test session.
+
+    The schema is created once; isolation between tests comes from the
+    per-test transaction rolled back by the ``session`` fixture. A
+    ``:memory:`` database lives only as long as its DB-API connection, so
+    the engine uses ``StaticPool`` to hand that one connection to every
+    checkout; with a regular pool a new connection would see an empty
+    database without the schema. Under
+    pytest-xdist every worker is its own process, so each worker gets its
+    own in-memory database. The engine is disposed once, at session
+    teardown.
     """
-    from sqlalchemy import event
+    from sqlalchemy.pool import StaticPool
 
     engine = create_engine(
         "sqlite:///:memory:",
         echo=False,  # Set to True to see SQL queries during debugging
+        connect_args={"check_same_thread": False},
+        # Every checkout, from any thread, must see the same in-memory database
+        poolclass=StaticPool,
+        # Room for every distinct statement the suite compiles, so none are
+        # evicted and recompiled part-way through a run
+        query_cache_size=1200,
     )
 
-    # Enable foreign key constraints for SQLite
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
         cursor = dbapi_conn.cursor()
+        # The test database is throwaway, so skip journaling and fsyncs
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+        # Enable foreign key constraints for SQLite
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
+        # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+        dbapi_conn.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
     SQLModel.metadata.create_all(engine)
-    return engine
+    yield engine
+    engine.dispose()
 
 
 @pytest.fixture(scope="function")
@@ -56,15 +83,132 @@ async def session(test_engine) -> AsyncGenerator[Session, None]:
     """
     Provide a database session for each test.
 
-    This fixture creates a new session for each test and ensures
-    proper cleanup after the test completes.
+    The session joins an outer transaction on a dedicated connection and
+    turns its own commits/rollbacks into SAVEPOINTs, so everything a test
+    writes is discarded when the outer transaction is rolled back. Objects
+    are not expired on commit, so tests can keep reading attributes after
+    committing without a re-SELECT. Autoflush is off: factories and tests
+    flush explicitly once their rows are staged, so queries don't re-scan
+    the session for pending changes.
     """
-    with Session(test_engine) as session:
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    with Session(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+        autoflush=False,
+    ) as session:
         yield session
-        session.rollback()  # Rollback any uncommitted changes
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def count_queries(session: Session):
+    """
+    Context manager recording the SQL statements a test's session executes.
+
+    Used to pin down how many round trips a query path costs, so a lazy
+    load slipping into it shows up as a failing assertion.
+
+    Usage:
+        with count_queries() as queries:
+            session.exec(statement).all()
+        assert len(queries) == 1
+    """
+
+    @contextmanager
+    def _count_queries() -> Generator[list[str], None, None]:
+        connection = session.connection()
+        queries: list[str] = []
+
+        def before_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            queries.append(statement)
+
+        event.listen(connection, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield queries
+        finally:
+            event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+    return _count_queries
+
+
+@pytest.fixture
+def no_lazy_loads(session: Session):
+    """
+    Context manager failing the test if a relationship is lazy loaded.
+
+    Wrap assertions that should only touch already loaded data, so a
+    relationship access added later fails loudly instead of quietly
+    issuing one SELECT per object.
+
+    Usage:
+        with no_lazy_loads():
+            assert result.shift_id == shift.id
+    """
+
+    @contextmanager
+    def _no_lazy_loads() -> Generator[None, None, None]:
+        def do_orm_execute(orm_execute_state):
+            if orm_execute_state.is_relationship_load:
+                pytest.fail(
+                    f"Unexpected relationship load: {orm_execute_state.statement}"
+                )
+
+        event.listen(session, "do_orm_execute", do_orm_execute)
+        try:
+            yield
+        finally:
+            event.remove(session, "do_orm_execute", do_orm_execute)
+
+    return _no_lazy_loads
+
+
+@pytest.fixture(scope="module")
+def default_member_group(test_engine) -> Generator[MemberGroup, None, None]:
+    """
+    Provide a MemberGroup shared by every test in a module.
+
+    For tests that need *a* group but don't care which one. It is committed
+    outside the per-test transaction and deleted when the module finishes.
+    """
+    with Session(test_engine, expire_on_commit=False) as session:
+        member_group = MemberGroup(name="Default")
+        session.add(member_group)
+        session.commit()
+        yield member_group
+        session.delete(member_group)
+        session.commit()
+
+
+@pytest.fixture(scope="module")
+def default_shift(test_engine) -> Generator[Shift, None, None]:
+    """
+    Provide a Shift shared by every test in a module.
+
+    The parent template for scheduled shifts whose tests don't care which
+    shift they belong to. Committed and deleted like ``default_member_group``.
+    """
+    with Session(test_engine, expire_on_commit=False) as session:
+        shift = Shift(description="Default", members_required=1, days=["1"])
+        session.add(shift)
+        session.commit()
+        yield shift
+        session.delete(shift)
+        session.commit()
 
 
 # Factory Fixtures for Test Data
+#
+# Factories flush instead of committing: rows are written inside the test's
+# transaction (so ids and foreign keys are usable immediately) and the
+# per-test rollback discards them, without paying for a commit per entity.
+# Ids and timestamps are generated client-side, so returned objects are not
+# refreshed from the database.
 
 
 @pytest.fixture
@@ -79,8 +223,7 @@ def member_group_factory(session: Session):
     def _create_member_group(name: str = "Test Group", **kwargs) -> MemberGroup:
         member_group = MemberGroup(name=name, **kwargs)
         session.add(member_group)
-        session.commit()
-        session.refresh(member_group)
+        session.flush()
         return member_group
 
     return _create_member_group
@@ -114,8 +257,7 @@ def member_factory(session: Session, member_group_factory):
             name=name, email=email, member_group_id=member_group_id, **kwargs
         )
         session.add(member)
-        session.commit()
-        session.refresh(member)
+        session.flush()
         return member
 
     return _create_member
@@ -154,15 +296,50 @@ def shift_factory(session: Session):
             **kwargs,
         )
         session.add(shift)
-        session.commit()
-        session.refresh(shift)
+        session.flush()
         return shift
 
     return _create_shift
 
 
 @pytest.fixture
-def shift_scheduled_factory(session: Session, shift_factory):
+def shift_factory_bulk(session: Session):
+    """
+    Factory fixture for creating several Shift instances at once.
+
+    Each dict holds the keyword arguments of one shift; missing fields get
+    the same defaults as ``shift_factory``. All shifts are written with a
+    single flush.
+
+    Usage:
+        shifts = shift_factory_bulk(
+            [{"description": "Morning"}, {"description": "Night"}]
+        )
+    """
+
+    def _create_shifts(rows: list[dict]) -> list[Shift]:
+        shifts = [
+            Shift(
+                **{
+                    "seconds_since_midnight": 0,
+                    "duration_seconds": 3600,
+                    "days": ["1"],  # Default to Monday
+                    "description": "",
+                    "members_required": 1,
+                    **row,
+                }
+            )
+            for row in rows
+        ]
+        session.add_all(shifts)
+        session.flush()
+        return shifts
+
+    return _create_shifts
+
+
+@pytest.fixture
+def shift_scheduled_factory(session: Session, default_shift):
     """
     Factory fixture for creating ShiftScheduled instances.
 
@@ -180,10 +357,9 @@ def shift_scheduled_factory(session: Session, shift_factory):
         description: str = "",
         **kwargs,
     ) -> ShiftScheduled:
-        # Auto-create a shift if not provided
+        # Share the module's default shift if not provided
         if shift_id is None:
-            shift = shift_factory()
-            shift_id = shift.id
+            shift_id = default_shift.id
 
         # Default to today 9am-5pm if times not provided
         if start_at is None:
@@ -201,13 +377,49 @@ def shift_scheduled_factory(session: Session, shift_factory):
             **kwargs,
         )
         session.add(shift_scheduled)
-        session.commit()
-        session.refresh(shift_scheduled)
+        session.flush()
         return shift_scheduled
 
     return _create_shift_scheduled
 
 
+@pytest.fixture
+def shift_scheduled_factory_bulk(session: Session, default_shift):
+    """
+    Factory fixture for creating several ShiftScheduled instances at once.
+
+    Each dict holds the keyword arguments of one scheduled shift. All rows
+    are added together and written with a single flush.
+
+    Usage:
+        scheduled = shift_scheduled_factory_bulk(
+            [{"description": "Jan 20"}, {"description": "Jan 25"}],
+            shift_id=shift.id,
+        )
+    """
+
+    def _create_shifts_scheduled(
+        rows: list[dict], shift_id: uuid.UUID | None = None
+    ) -> list[ShiftScheduled]:
+        # Share the module's default shift if not provided
+        if shift_id is None:
+            shift_id = default_shift.id
+
+        default_start = datetime.now(timezone.utc).replace(
+            hour=9, minute=0, second=0, microsecond=0
+        )
+        shifts_scheduled = []
+        for row in rows:
+            row = {"shift_id": shift_id, "start_at": default_start, **row}
+            row.setdefault("end_at", row["start_at"] + timedelta(hours=8))
+            shifts_scheduled.append(ShiftScheduled(**row))
+        session.add_all(shifts_scheduled)
+        session.flush()
+        return shifts_scheduled
+
+    return _create_shifts_scheduled
+
+
 @pytest.fixture
 def member_request_factory(session: Session, member_factory):
     """
@@ -249,13 +461,50 @@ def member_request_factory(session: Session, member_factory):
             **kwargs,
         )
         session.add(member_request)
-        session.commit()
-        session.refresh(member_request)
+        session.flush()
         return member_request
 
     return _create_member_request
 
 
+@pytest.fixture
+def member_request_factory_bulk(session: Session, member_factory):
+    """
+    Factory fixture for creating several MemberRequest instances at once.
+
+    Each dict holds the keyword arguments of one request. All requests are
+    added together and written with a single flush, so SQLAlchemy can batch
+    the INSERTs instead of flushing once per row.
+
+    Usage:
+        requests = member_request_factory_bulk(
+            [{"description": "Vacation"}, {"description": "Conference"}],
+            member_id=member.id,
+        )
+    """
+
+    def _create_member_requests(
+        rows: list[dict], member_id: uuid.UUID | None = None
+    ) -> list[MemberRequest]:
+        # Auto-create a single member shared by every request if not provided
+        if member_id is None:
+            member_id = member_factory().id
+
+        default_start = datetime.now(timezone.utc).replace(
+            hour=9, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+        member_requests = []
+        for row in rows:
+            row = {"member_id": member_id, "start_at": default_start, **row}
+            row.setdefault("end_at", row["start_at"] + timedelta(hours=8))
+            member_requests.append(MemberRequest(**row))
+        session.add_all(member_requests)
+        session.flush()
+        return member_requests
+
+    return _create_member_requests
+
+
 @pytest.fixture
 def shift_constraint_factory(session: Session, shift_factory):
     """
@@ -291,13 +540,54 @@ def shift_constraint_factory(session: Session, shift_factory):
             **kwargs,
         )
         session.add(constraint)
-        session.commit()
-        session.refresh(constraint)
+        session.flush()
         return constraint
 
     return _create_shift_constraint
 
 
+@pytest.fixture
+def shift_constraint_factory_bulk(session: Session, shift_factory_bulk):
+    """
+    Factory fixture for creating several ShiftConstraint instances at once.
+
+    Each dict holds the keyword arguments of one constraint. Rows without
+    ``shift_id``/``linked_shift_id`` get a fresh pair of shifts, all created
+    in one flush, and the constraints are then written in a second flush.
+
+    Usage:
+        constraints = shift_constraint_factory_bulk(
+            [{"within_last_shifts": 1}, {"within_last_shifts": 2}]
+        )
+    """
+
+    def _create_shift_constraints(rows: list[dict]) -> list[ShiftConstraint]:
+        rows = [dict(row) for row in rows]
+        # Auto-create shifts for every missing side of every constraint
+        missing = [
+            (row, key, description)
+            for row in rows
+            for key, description in (
+                ("shift_id", "Primary Shift"),
+                ("linked_shift_id", "Linked Shift"),
+            )
+            if key not in row
+        ]
+        if missing:
+            shifts = shift_factory_bulk(
+                [{"description": description} for _, _, description in missing]
+            )
+            for (row, key, _), shift in zip(missing, shifts):
+                row[key] = shift.id
+
+        constraints = [ShiftConstraint(**row) for row in rows]
+        session.add_all(constraints)
+        session.flush()
+        return constraints
+
+    return _create_shift_constraints
+
+
 @pytest.fixture
 def member_shift_scheduled_factory(
     session: Session, member_factory, shift_scheduled_factory
@@ -330,8 +620,32 @@ def member_shift_scheduled_factory(
             member_id=member_id, shift_scheduled_id=shift_scheduled_id, **kwargs
         )
         session.add(link)
-        session.commit()
-        session.refresh(link)
+        session.flush()
         return link
 
     return _create_member_shift_scheduled
+
+
+@pytest.fixture
+def member_shift_scheduled_factory_bulk(session: Session):
+    """
+    Factory fixture for creating several MemberShiftScheduled links at once.
+
+    Each dict holds the ``member_id`` and ``shift_scheduled_id`` of one link.
+    Links are plain association rows, so they are inserted as mappings in a
+    single executemany, bypassing the unit of work.
+
+    Usage:
+        links = member_shift_scheduled_factory_bulk(
+            [
+                {"member_id": member.id, "shift_scheduled_id": shift1.id},
+                {"member_id": member.id, "shift_scheduled_id": shift2.id},
+            ]
+        )
+    """
+
+    def _create_member_shifts_scheduled(rows: list[dict]) -> None:
+        session.bulk_insert_mappings(MemberShiftScheduled, rows)
+        session.flush()
+
+    return _create_member_shifts_scheduled
@@ -2,13 +2,64 @@
 Tests for ICS calendar export functionality.
 """
 
+import mmap
+import re
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import pytest
 from sqlmodel import Session
 
+from services import schedule_service
 from services.schedule_service import export_all_members_ics, export_member_ics
 
+# Calendar structure every exported file must contain
+ICS_STRUCTURE_TOKENS = {
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:",
+    "END:VCALENDAR",
+}
+
+# Tokens looked for in exported files, matched in a single regex pass over
+# the raw bytes. Longer tokens come first so e.g. "Morning Shift - Alice Smith"
+# is not consumed as "Morning Shift".
+_ICS_TOKEN_RE = re.compile(
+    b"|".join(
+        re.escape(token.encode("utf-8"))
+        for token in [
+            *sorted(ICS_STRUCTURE_TOKENS),
+            "BEGIN:VEVENT",
+            "END:VEVENT",
+            "Morning Shift - Alice Smith",
+            "Evening Shift - Bob Jones",
+            "Morning Shift",
+            "Evening Shift",
+            "Day Shift",
+        ]
+    )
+)
+
+
+def _buffer_tokens(buffer: bytes | mmap.mmap) -> set[str]:
+    """Return the set of known ICS tokens present in a raw ICS buffer."""
+    return {token.decode("utf-8") for token in _ICS_TOKEN_RE.findall(buffer)}
+
+
+def _ics_tokens(ics_file: Path) -> set[str]:
+    """Return the set of known ICS tokens present in an exported file."""
+    with (
+        ics_file.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        return _buffer_tokens(mm)
+
+
+@pytest.fixture(scope="class")
+def ics_root(tmp_path_factory) -> Path:
+    """Temporary directory shared by a test class; each test uses its own subdir."""
+    return tmp_path_factory.mktemp("ics")
+
 
 class TestICSExport:
     """Test suite for ICS calendar export operations."""
@@ -19,7 +70,7 @@ class TestICSExport:
         member_factory,
         shift_scheduled_factory,
         member_shift_scheduled_factory,
-        tmp_path: Path,
+        ics_root: Path,
     ):
         """Test exporting ICS file for a single member."""
         # Arrange
@@ -47,7 +98,7 @@ class TestICSExport:
         )
 
         # Act
-        output_dir = tmp_path / "ics_exports"
+        output_dir = ics_root / "ics_exports"
         export_member_ics(
             session=session,
             member_id=member.id,
@@ -60,20 +111,15 @@ class TestICSExport:
         ics_file = output_dir / f"{member.email}.ics"
         assert ics_file.exists(), "ICS file should be created"
 
-        # Read and verify ICS content
-        content = ics_file.read_text()
-
-        # Verify ICS format
-        assert content.startswith("BEGIN:VCALENDAR"), "Should start with VCALENDAR"
-        assert "VERSION:2.0" in content, "Should have version 2.0"
-        assert "PRODID:" in content, "Should have PRODID"
-        assert "BEGIN:VEVENT" in content, "Should contain at least one event"
-        assert "END:VEVENT" in content, "Should end event properly"
-        assert "END:VCALENDAR" in content, "Should end with VCALENDAR"
-
-        # Verify shift details are in the ICS
-        assert "Morning Shift" in content, "Should contain shift description"
-        assert "Day Shift" in content, "Should contain second shift description"
+        # Verify ICS format and shift details from a single read of the file
+        content = ics_file.read_bytes()
+        assert content.startswith(b"BEGIN:VCALENDAR"), "Should start with VCALENDAR"
+        assert _buffer_tokens(content) >= ICS_STRUCTURE_TOKENS | {
+            "BEGIN:VEVENT",
+            "END:VEVENT",
+            "Morning Shift",
+            "Day Shift",
+        }
 
     def test_export_all_members_ics(
         self,
@@ -81,7 +127,7 @@ class TestICSExport:
         member_factory,
         shift_scheduled_factory,
         member_shift_scheduled_factory,
-        tmp_path: Path,
+        ics_root: Path,
     ):
         """Test exporting ICS files for all members including global file."""
         # Arrange
@@ -110,7 +156,7 @@ class TestICSExport:
         )
 
         # Act
-        output_dir = tmp_path / "ics_exports_all"
+        output_dir = ics_root / "ics_exports_all"
         export_all_members_ics(
             session=session,
             start=start_date,
@@ -129,23 +175,23 @@ class TestICSExport:
         assert global_ics.exists(), "Global ICS file should be created"
 
         # Assert - Verify Alice's file content
-        alice_content = alice_ics.read_text()
-        assert "BEGIN:VCALENDAR" in alice_content
-        assert "Morning Shift" in alice_content
-        assert "Evening Shift" not in alice_content, "Should not contain Bob's shift"
+        alice_tokens = _ics_tokens(alice_ics)
+        assert alice_tokens >= {"BEGIN:VCALENDAR", "Morning Shift"}
+        assert "Evening Shift" not in alice_tokens, "Should not contain Bob's shift"
 
         # Assert - Verify Bob's file content
-        bob_content = bob_ics.read_text()
-        assert "BEGIN:VCALENDAR" in bob_content
-        assert "Evening Shift" in bob_content
-        assert "Morning Shift" not in bob_content, "Should not contain Alice's shift"
+        bob_tokens = _ics_tokens(bob_ics)
+        assert bob_tokens >= {"BEGIN:VCALENDAR", "Evening Shift"}
+        assert "Morning Shift" not in bob_tokens, "Should not contain Alice's shift"
 
         # Assert - Verify global file content
-        global_content = global_ics.read_text()
-        assert "BEGIN:VCALENDAR" in global_content
-        assert "VERSION:2.0" in global_content
-        assert "Morning Shift - Alice Smith" in global_content
-        assert "Evening Shift - Bob Jones" in global_content
+        global_tokens = _ics_tokens(global_ics)
+        assert global_tokens >= {
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "Morning Shift - Alice Smith",
+            "Evening Shift - Bob Jones",
+        }
 
     def test_ics_format_validation(
         self,
@@ -153,7 +199,7 @@ class TestICSExport:
         member_factory,
         shift_scheduled_factory,
         member_shift_scheduled_factory,
-        tmp_path: Path,
+        ics_root: Path,
     ):
         """Test that generated ICS files have correct RFC 5545 format."""
         # Arrange
@@ -167,7 +213,7 @@ class TestICSExport:
         member_shift_scheduled_factory(member_id=member.id, shift_scheduled_id=shift.id)
 
         # Act
-        output_dir = tmp_path / "ics_validation"
+        output_dir = ics_root / "ics_validation"
         export_member_ics(
             session=session,
             member_id=member.id,
@@ -192,45 +238,43 @@ class TestICSExport:
         assert lines[-1] == "", "File should end with empty line after final CRLF"
         assert lines[-2] == "END:VCALENDAR", "Second to last line must be END:VCALENDAR"
 
-        # Verify required calendar properties
-        assert any("VERSION:2.0" in line for line in lines), "Must have VERSION:2.0"
-        assert any("PRODID:" in line for line in lines), "Must have PRODID"
-        assert any("CALSCALE:GREGORIAN" in line for line in lines), (
-            "Should have CALSCALE"
-        )
-        assert any("METHOD:PUBLISH" in line for line in lines), "Should have METHOD"
-
-        # Find event section
+        # Single pass: index calendar and first-event properties by name
+        calendar_props = {}
+        event_props = {}
         event_start = None
         event_end = None
         for i, line in enumerate(lines):
-            if line == "BEGIN:VEVENT":
+            if line == "BEGIN:VEVENT" and event_start is None:
                 event_start = i
-            if line == "END:VEVENT":
+            elif line == "END:VEVENT" and event_end is None:
                 event_end = i
-                break
+            elif ":" in line:
+                name, value = line.split(":", 1)
+                if event_start is None:
+                    calendar_props.setdefault(name, value)
+                elif event_end is None:
+                    event_props.setdefault(name, value)
+
+        # Verify required calendar properties
+        assert calendar_props.get("VERSION") == "2.0", "Must have VERSION:2.0"
+        assert "PRODID" in calendar_props, "Must have PRODID"
+        assert calendar_props.get("CALSCALE") == "GREGORIAN", "Should have CALSCALE"
+        assert calendar_props.get("METHOD") == "PUBLISH", "Should have METHOD"
 
+        # Verify event section
         assert event_start is not None, "Must have BEGIN:VEVENT"
         assert event_end is not None, "Must have END:VEVENT"
         assert event_start < event_end, "BEGIN:VEVENT must come before END:VEVENT"
 
         # Verify required event properties
-        event_lines = lines[event_start : event_end + 1]
-        assert any("UID:" in line for line in event_lines), "Event must have UID"
-        assert any("DTSTAMP:" in line for line in event_lines), (
-            "Event must have DTSTAMP"
-        )
-        assert any("DTSTART:" in line for line in event_lines), (
-            "Event must have DTSTART"
-        )
-        assert any("DTEND:" in line for line in event_lines), "Event must have DTEND"
-        assert any("SUMMARY:" in line for line in event_lines), (
-            "Event must have SUMMARY"
-        )
+        assert "UID" in event_props, "Event must have UID"
+        assert "DTSTAMP" in event_props, "Event must have DTSTAMP"
+        assert "DTSTART" in event_props, "Event must have DTSTART"
+        assert "DTEND" in event_props, "Event must have DTEND"
+        assert "SUMMARY" in event_props, "Event must have SUMMARY"
 
         # Verify datetime format (YYYYMMDDTHHMMSS for floating time - no timezone)
-        dtstart_line = [line for line in event_lines if line.startswith("DTSTART:")][0]
-        dtstart_value = dtstart_line.split(":")[1]
+        dtstart_value = event_props["DTSTART"]
         assert len(dtstart_value) == 15, (
             "DTSTART should be in YYYYMMDDTHHMMSS format (floating time)"
         )
@@ -240,12 +284,111 @@ class TestICSExport:
         # Floating time means it should display in the user's local timezone
         assert dtstart_value == "20250215T143000", "DTSTART should match start time"
 
-        dtend_line = [line for line in event_lines if line.startswith("DTEND:")][0]
-        dtend_value = dtend_line.split(":")[1]
-        assert dtend_value == "20250215T183000", (
+        assert event_props["DTEND"] == "20250215T183000", (
             "DTEND should match end time (floating time)"
         )
 
         # Verify SUMMARY contains the description
-        summary_line = [line for line in event_lines if line.startswith("SUMMARY:")][0]
-        assert "Test Event" in summary_line, "SUMMARY should contain event description"
+        assert "Test Event" in event_props["SUMMARY"], (
+            "SUMMARY should contain event description"
+        )
+
+    def test_export_all_members_ics_member_without_shifts(
+        self,
+        session: Session,
+        member_factory,
+        shift_scheduled_factory,
+        member_shift_scheduled_factory,
+        ics_root: Path,
+    ):
+        """Test members with no shifts in range still get an empty calendar."""
+        # Arrange
+        busy = member_factory(name="Busy Member", email="busy@example.com")
+        member_factory(name="Idle Member", email="idle@example.com")
+        start_date = datetime(2025, 3, 10, 9, 0, tzinfo=timezone.utc)
+        shift = shift_scheduled_factory(
+            start_at=start_date,
+            end_at=start_date + timedelta(hours=8),
+            description="Only Shift",
+        )
+        member_shift_scheduled_factory(member_id=busy.id, shift_scheduled_id=shift.id)
+
+        # Act
+        output_dir = ics_root / "ics_exports_idle"
+        export_all_members_ics(
+            session=session,
+            start=start_date,
+            end=start_date + timedelta(days=7),
+            output_dir=str(output_dir),
+        )
+
+        # Assert
+        idle_content = (output_dir / "idle@example.com.ics").read_text(newline="")
+        assert idle_content == (
+            "BEGIN:VCALENDAR\r\n"
+            "VERSION:2.0\r\n"
+            "PRODID:-//Healthy Shifts//Schedule Export//EN\r\n"
+            "CALSCALE:GREGORIAN\r\n"
+            "METHOD:PUBLISH\r\n"
+            "END:VCALENDAR\r\n"
+        )
+        busy_content = (output_dir / "busy@example.com.ics").read_text()
+        assert busy_content.count("BEGIN:VEVENT") == 1
+        assert f"UID:{shift.id}@healthyshifts.local" in busy_content
+
+    def test_export_uses_single_dtstamp(
+        self,
+        session: Session,
+        member_factory,
+        shift_scheduled_factory,
+        member_shift_scheduled_factory,
+        ics_root: Path,
+    ):
+        """Test every event of one export shares the same DTSTAMP."""
+        # Arrange
+        member = member_factory(name="Stamp Member", email="stamp@example.com")
+        start_date = datetime(2025, 4, 7, 9, 0, tzinfo=timezone.utc)
+        for day in range(3):
+            shift = shift_scheduled_factory(
+                start_at=start_date + timedelta(days=day),
+                end_at=start_date + timedelta(days=day, hours=8),
+            )
+            member_shift_scheduled_factory(
+                member_id=member.id, shift_scheduled_id=shift.id
+            )
+
+        # Act
+        output_dir = ics_root / "ics_dtstamp"
+        export_all_members_ics(
+            session=session,
+            start=start_date,
+            end=start_date + timedelta(days=7),
+            output_dir=str(output_dir),
+        )
+
+        # Assert
+        content = (output_dir / "all_members.ics").read_text(newline="")
+        dtstamps = [
+            line for line in content.split("\r\n") if line.startswith("DTSTAMP:")
+        ]
+        assert len(dtstamps) == 3
+        assert len(set(dtstamps)) == 1
+
+    def test_write_ics_file_in_small_chunks(self, ics_root: Path, monkeypatch):
+        """Test chunked writes produce the same file as a single write."""
+        # Arrange
+        monkeypatch.setattr(schedule_service, "ICS_WRITE_CHUNK_SIZE", 16)
+        vevents = [
+            f"BEGIN:VEVENT\r\nUID:{i}\r\nEND:VEVENT\r\n".encode() for i in range(50)
+        ]
+        ics_file = ics_root / "chunked.ics"
+
+        # Act
+        schedule_service._write_ics_file(ics_file, vevents)
+
+        # Assert
+        assert ics_file.read_bytes() == (
+            schedule_service._ICS_HEADER
+            + b"".join(vevents)
+            + schedule_service._ICS_FOOTER
+        )
@@ -6,35 +6,40 @@ import uuid
 from datetime import datetime
 
 import pytest
+from sqlalchemy import bindparam
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from models import Member
 
+_MEMBERS = select(Member)
+_MEMBER_BY_ID = _MEMBERS.where(Member.id == bindparam("id"))
+_MEMBERS_BY_GROUP = _MEMBERS.where(
+    Member.member_group_id == bindparam("member_group_id")
+)
+
 
 class TestMemberCRUD:
     """Test suite for Member Create, Read, Update, Delete operations."""
 
-    def test_create_member(self, session: Session, member_group_factory):
+    def test_create_member(self, session: Session, default_member_group):
         """Test creating a new member."""
-        # Arrange
-        member_group = member_group_factory(name="Engineering")
-
         # Act
         member = Member(
             name="John Doe",
             email="john.doe@example.com",
-            member_group_id=member_group.id,
+            member_group_id=default_member_group.id,
         )
         session.add(member)
         session.commit()
-        session.refresh(member)
 
         # Assert
         assert member.id is not None
         assert isinstance(member.id, uuid.UUID)
+        assert member.id.version == 7  # time-ordered primary key
         assert member.name == "John Doe"
         assert member.email == "john.doe@example.com"
-        assert member.member_group_id == member_group.id
+        assert member.member_group_id == default_member_group.id
         assert isinstance(member.created_at, datetime)
         assert isinstance(member.updated_at, datetime)
 
@@ -55,8 +60,7 @@ class TestMemberCRUD:
         created_member = member_factory(name="Alice Brown", email="alice@example.com")
 
         # Act
-        statement = select(Member).where(Member.id == created_member.id)
-        result = session.exec(statement).first()
+        result = session.exec(_MEMBER_BY_ID, params={"id": created_member.id}).first()
 
         # Assert
         assert result is not None
@@ -72,13 +76,15 @@ class TestMemberCRUD:
         member_factory(name="Member 3", email="m3@example.com")
 
         # Act
-        statement = select(Member)
-        results = session.exec(statement).all()
+        member_emails = session.exec(select(Member.email)).all()
 
         # Assert
-        assert len(results) == 3
-        member_emails = {member.email for member in results}
-        assert member_emails == {"m1@example.com", "m2@example.com", "m3@example.com"}
+        assert len(member_emails) == 3
+        assert set(member_emails) == {
+            "m1@example.com",
+            "m2@example.com",
+            "m3@example.com",
+        }
 
     def test_update_member(self, session: Session, member_factory):
         """Test updating a member's information."""
@@ -92,7 +98,6 @@ class TestMemberCRUD:
         member.email = "new@example.com"
         session.add(member)
         session.commit()
-        session.refresh(member)
 
         # Assert
         assert member.id == original_id
@@ -111,8 +116,7 @@ class TestMemberCRUD:
         session.commit()
 
         # Assert
-        statement = select(Member).where(Member.id == member_id)
-        result = session.exec(statement).first()
+        result = session.exec(_MEMBER_BY_ID, params={"id": member_id}).first()
         assert result is None
 
 
@@ -132,8 +136,7 @@ class TestMemberRelationships:
         )
 
         # Act
-        statement = select(Member).where(Member.id == member.id)
-        retrieved_member = session.exec(statement).first()
+        retrieved_member = session.exec(_MEMBER_BY_ID, params={"id": member.id}).first()
 
         # Assert
         assert retrieved_member is not None
@@ -156,13 +159,13 @@ class TestMemberRelationships:
         )
 
         # Act
-        statement = select(Member).where(Member.member_group_id == member_group.id)
-        members = session.exec(statement).all()
+        member_names = session.exec(
+            select(Member.name).where(Member.member_group_id == member_group.id)
+        ).all()
 
         # Assert
-        assert len(members) == 3
-        member_names = {member.name for member in members}
-        assert member_names == {"Dev 1", "Dev 2", "Dev 3"}
+        assert len(member_names) == 3
+        assert set(member_names) == {"Dev 1", "Dev 2", "Dev 3"}
 
     def test_query_members_by_group(
         self, session: Session, member_group_factory, member_factory
@@ -183,8 +186,9 @@ class TestMemberRelationships:
         )
 
         # Act
-        statement = select(Member).where(Member.member_group_id == group1.id)
-        group1_members = session.exec(statement).all()
+        group1_members = session.exec(
+            _MEMBERS_BY_GROUP, params={"member_group_id": group1.id}
+        ).all()
 
         # Assert
         assert len(group1_members) == 2
@@ -194,14 +198,13 @@ class TestMemberRelationships:
 class TestMemberConstraints:
     """Test suite for Member validation and constraints."""
 
-    def test_member_email_must_be_unique(self, session: Session, member_group_factory):
+    def test_member_email_must_be_unique(self, session: Session, default_member_group):
         """Test that member emails must be unique."""
         # Arrange
-        member_group = member_group_factory(name="Test Group")
         member1 = Member(
             name="Member 1",
             email="duplicate@example.com",
-            member_group_id=member_group.id,
+            member_group_id=default_member_group.id,
         )
         session.add(member1)
         session.commit()
@@ -210,56 +213,46 @@ class TestMemberConstraints:
         member2 = Member(
             name="Member 2",
             email="duplicate@example.com",
-            member_group_id=member_group.id,
+            member_group_id=default_member_group.id,
         )
         session.add(member2)
-        with pytest.raises(Exception):  # SQLite IntegrityError
+        with pytest.raises(IntegrityError):  # UNIQUE constraint
             session.commit()
 
-    def test_member_requires_name(self, session: Session, member_group_factory):
-        """Test that a member requires a name field."""
-        # Arrange
-        member_group = member_group_factory(name="Test Group")
-
-        # Act & Assert
-        with pytest.raises(Exception):
-            session.add(
-                Member(email="test@example.com", member_group_id=member_group.id)
-            )
-            session.commit()
-
-    def test_member_requires_email(self, session: Session, member_group_factory):
-        """Test that a member requires an email field."""
-        # Arrange
-        member_group = member_group_factory(name="Test Group")
-
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"email": "test@example.com"}, id="requires_name"),
+            pytest.param({"name": "Test Member"}, id="requires_email"),
+            pytest.param(
+                {
+                    "name": "Test Member",
+                    "email": "test@example.com",
+                    "member_group_id": None,
+                },
+                id="requires_member_group_id",
+            ),
+        ],
+    )
+    def test_member_missing_field(
+        self, session: Session, default_member_group, kwargs: dict
+    ):
+        """Test that a member with a missing required field is rejected."""
         # Act & Assert
-        with pytest.raises(Exception):
-            session.add(Member(name="Test Member", member_group_id=member_group.id))
+        session.add(Member(**{"member_group_id": default_member_group.id, **kwargs}))
+        with pytest.raises(IntegrityError):  # NOT NULL constraint
             session.commit()
+        session.rollback()
 
-    def test_member_validates_email(self, session: Session, member_group_factory):
-        """Test that a member requires an email field."""
-        # Arrange
-        member_group = member_group_factory(name="Test Group")
-
+    def test_member_validates_email(self, default_member_group):
+        """Test that a malformed email is rejected before reaching the database."""
         # Act & Assert
-        with pytest.raises(Exception):
-            session.add(
-                Member(
-                    name="Test Member",
-                    email="testexample.com",
-                    member_group_id=member_group.id,
-                )
+        with pytest.raises(ValueError):
+            Member(
+                name="Test Member",
+                email="testexample.com",
+                member_group_id=default_member_group.id,
             )
-            session.commit()
-
-    def test_member_requires_member_group_id(self, session: Session):
-        """Test that a member requires a member_group_id."""
-        # Act & Assert
-        with pytest.raises(Exception):
-            session.add(Member(name="Test Member", email="test@example.com"))
-            session.commit()
 
     def test_member_foreign_key_constraint(self, session: Session):
         """Test that member_group_id must reference an existing member group."""
@@ -273,5 +266,5 @@ class TestMemberConstraints:
             member_group_id=non_existent_group_id,
         )
         session.add(member)
-        with pytest.raises(Exception):  # Foreign key constraint violation
+        with pytest.raises(IntegrityError):  # Foreign key constraint violation
             session.commit()
@@ -23,7 +23,6 @@ class TestMemberGroupCRUD:
         member_group = MemberGroup(name=group_name)
         session.add(member_group)
         session.commit()
-        session.refresh(member_group)
 
         # Assert
         assert member_group.id is not None
@@ -65,13 +64,12 @@ class TestMemberGroupCRUD:
         member_group_factory(name="Group 3")
 
         # Act
-        statement = select(MemberGroup)
-        results = session.exec(statement).all()
+        statement = select(MemberGroup.name)
+        group_names = session.exec(statement).all()
 
         # Assert
-        assert len(results) == 3
-        group_names = {group.name for group in results}
-        assert group_names == {"Group 1", "Group 2", "Group 3"}
+        assert len(group_names) == 3
+        assert set(group_names) == {"Group 1", "Group 2", "Group 3"}
 
     def test_update_member_group(self, session: Session, member_group_factory):
         """Test updating a member group's name."""
@@ -84,7 +82,6 @@ class TestMemberGroupCRUD:
         member_group.name = "New Name"
         session.add(member_group)
         session.commit()
-        session.refresh(member_group)
 
         # Assert
         assert member_group.id == original_id
@@ -6,10 +6,34 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import bindparam
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from models import Member, MemberRequest
 
+# Dates shared by several tests, built once at import
+_FEB_1 = datetime(2025, 2, 1)
+_FEB_3 = datetime(2025, 2, 3)
+
+_REQUESTS = select(MemberRequest)
+_REQUEST_BY_ID = _REQUESTS.where(MemberRequest.id == bindparam("id"))
+_REQUESTS_BY_MEMBER = _REQUESTS.where(MemberRequest.member_id == bindparam("member_id"))
+_REQUEST_DESCRIPTIONS = select(MemberRequest.description)
+_REQUEST_DESCRIPTIONS_BY_MEMBER = _REQUEST_DESCRIPTIONS.where(
+    MemberRequest.member_id == bindparam("member_id")
+)
+_REQUEST_DESCRIPTIONS_STARTING_BETWEEN = _REQUEST_DESCRIPTIONS.where(
+    MemberRequest.start_at >= bindparam("lo"),
+    MemberRequest.start_at < bindparam("hi"),
+)
+
+
+@pytest.fixture
+def seeded_request(member_request_factory) -> MemberRequest:
+    """Provide a single persisted request for the read/update/delete tests."""
+    return member_request_factory(description="Seed request")
+
 
 class TestMemberRequestCRUD:
     """Test suite for MemberRequest Create, Read, Update, Delete operations."""
@@ -18,16 +42,15 @@ class TestMemberRequestCRUD:
         """Test creating a new member request."""
         # Arrange
         member = member_factory(name="John Doe", email="john@example.com")
-        start = datetime(2025, 2, 1, 0, 0)
-        end = datetime(2025, 2, 3, 0, 0)
+        start = _FEB_1
+        end = _FEB_3
 
         # Act
         request = MemberRequest(
             start_at=start, end_at=end, member_id=member.id, description="Vacation"
         )
         session.add(request)
-        session.commit()
-        session.refresh(request)
+        session.flush()
 
         # Assert
         assert request.id is not None
@@ -55,43 +78,55 @@ class TestMemberRequestCRUD:
         assert request.member_id is not None
         assert request.description == "Doctor appointment"
 
-    def test_read_member_request(self, session: Session, member_request_factory):
+    @pytest.mark.parametrize(
+        ("statement", "param", "attribute"),
+        [
+            (_REQUEST_BY_ID, "id", "id"),
+            (_REQUESTS_BY_MEMBER, "member_id", "member_id"),
+        ],
+        ids=["by_id", "by_member"],
+    )
+    def test_read_member_request(
+        self, session: Session, seeded_request, statement, param, attribute
+    ):
         """Test reading a member request from the database."""
-        # Arrange
-        created = member_request_factory(description="Time off request")
-
         # Act
-        statement = select(MemberRequest).where(MemberRequest.id == created.id)
-        result = session.exec(statement).first()
+        result = session.exec(
+            statement, params={param: getattr(seeded_request, attribute)}
+        ).first()
 
         # Assert
         assert result is not None
-        assert result.id == created.id
-        assert result.start_at == created.start_at
-        assert result.end_at == created.end_at
-        assert result.member_id == created.member_id
-        assert result.description == "Time off request"
-
-    def test_read_all_member_requests(self, session: Session, member_request_factory):
+        assert result.id == seeded_request.id
+        assert result.start_at == seeded_request.start_at
+        assert result.end_at == seeded_request.end_at
+        assert result.member_id == seeded_request.member_id
+        assert result.description == "Seed request"
+
+    def test_read_all_member_requests(
+        self, session: Session, member_request_factory_bulk
+    ):
         """Test reading multiple member requests."""
         # Arrange
-        member_request_factory(description="Request 1")
-        member_request_factory(description="Request 2")
-        member_request_factory(description="Request 3")
+        member_request_factory_bulk(
+            [
+                {"description": "Request 1"},
+                {"description": "Request 2"},
+                {"description": "Request 3"},
+            ]
+        )
 
         # Act
-        statement = select(MemberRequest)
-        results = session.exec(statement).all()
+        descriptions = session.exec(_REQUEST_DESCRIPTIONS).all()
 
         # Assert
-        assert len(results) == 3
-        descriptions = {r.description for r in results}
-        assert descriptions == {"Request 1", "Request 2", "Request 3"}
+        assert len(descriptions) == 3
+        assert set(descriptions) == {"Request 1", "Request 2", "Request 3"}
 
-    def test_update_member_request(self, session: Session, member_request_factory):
+    def test_update_member_request(self, session: Session, seeded_request):
         """Test updating a member request's information."""
         # Arrange
-        request = member_request_factory(description="Original request")
+        request = seeded_request
         original_id = request.id
         new_start = request.start_at + timedelta(days=1)
         new_end = request.end_at + timedelta(days=1)
@@ -101,8 +136,7 @@ class TestMemberRequestCRUD:
         request.end_at = new_end
         request.description = "Updated request"
         session.add(request)
-        session.commit()
-        session.refresh(request)
+        session.flush()
 
         # Assert
         assert request.id == original_id
@@ -110,19 +144,17 @@ class TestMemberRequestCRUD:
         assert request.end_at == new_end
         assert request.description == "Updated request"
 
-    def test_delete_member_request(self, session: Session, member_request_factory):
+    def test_delete_member_request(self, session: Session, seeded_request):
         """Test deleting a member request."""
         # Arrange
-        request = member_request_factory(description="To be cancelled")
-        request_id = request.id
+        request_id = seeded_request.id
 
         # Act
-        session.delete(request)
-        session.commit()
+        session.delete(seeded_request)
+        session.flush()
 
         # Assert
-        statement = select(MemberRequest).where(MemberRequest.id == request_id)
-        result = session.exec(statement).first()
+        result = session.get(MemberRequest, request_id)
         assert result is None
 
 
@@ -140,48 +172,49 @@ class TestMemberRequestRelationships:
         )
 
         # Act
-        statement = select(MemberRequest).where(MemberRequest.id == request.id)
-        result = session.exec(statement).first()
+        result = session.exec(_REQUEST_BY_ID, params={"id": request.id}).first()
 
         # Assert
         assert result is not None
         assert result.member_id == member.id
 
     def test_member_can_have_multiple_requests(
-        self, session: Session, member_factory, member_request_factory
+        self, session: Session, member_factory, member_request_factory_bulk
     ):
         """Test that a member can have multiple requests."""
         # Arrange
         member = member_factory(name="Busy Member", email="busy@example.com")
 
         # Create multiple requests for the same member
-        member_request_factory(
-            member_id=member.id,
-            start_at=datetime(2025, 2, 1),
-            end_at=datetime(2025, 2, 3),
-            description="February vacation",
-        )
-        member_request_factory(
+        member_request_factory_bulk(
+            [
+                {
+                    "start_at": _FEB_1,
+                    "end_at": _FEB_3,
+                    "description": "February vacation",
+                },
+                {
+                    "start_at": datetime(2025, 3, 15),
+                    "end_at": datetime(2025, 3, 16),
+                    "description": "March appointment",
+                },
+                {
+                    "start_at": datetime(2025, 4, 20),
+                    "end_at": datetime(2025, 4, 22),
+                    "description": "April conference",
+                },
+            ],
             member_id=member.id,
-            start_at=datetime(2025, 3, 15),
-            end_at=datetime(2025, 3, 16),
-            description="March appointment",
-        )
-        member_request_factory(
-            member_id=member.id,
-            start_at=datetime(2025, 4, 20),
-            end_at=datetime(2025, 4, 22),
-            description="April conference",
         )
 
         # Act
-        statement = select(MemberRequest).where(MemberRequest.member_id == member.id)
-        results = session.exec(statement).all()
+        descriptions = session.exec(
+            _REQUEST_DESCRIPTIONS_BY_MEMBER, params={"member_id": member.id}
+        ).all()
 
         # Assert
-        assert len(results) == 3
-        descriptions = {r.description for r in results}
-        assert descriptions == {
+        assert len(descriptions) == 3
+        assert set(descriptions) == {
             "February vacation",
             "March appointment",
             "April conference",
@@ -200,13 +233,13 @@ class TestMemberRequestRelationships:
         member_request_factory(member_id=member2.id, description="M2-R1")
 
         # Act
-        statement = select(MemberRequest).where(MemberRequest.member_id == member1.id)
-        results = session.exec(statement).all()
+        descriptions = session.exec(
+            _REQUEST_DESCRIPTIONS_BY_MEMBER, params={"member_id": member1.id}
+        ).all()
 
         # Assert
-        assert len(results) == 2
-        descriptions = {r.description for r in results}
-        assert descriptions == {"M1-R1", "M1-R2"}
+        assert len(descriptions) == 2
+        assert set(descriptions) == {"M1-R1", "M1-R2"}
 
     def test_delete_member_request_does_not_delete_member(
         self, session: Session, member_factory, member_request_factory
@@ -220,11 +253,10 @@ class TestMemberRequestRelationships:
 
         # Act
         session.delete(request)
-        session.commit()
+        session.flush()
 
         # Assert - member should still exist
-        statement = select(Member).where(Member.id == member.id)
-        result = session.exec(statement).first()
+        result = session.get(Member, member.id)
         assert result is not None
         assert result.name == "Test Member"
 
@@ -232,32 +264,34 @@ class TestMemberRequestRelationships:
 class TestMemberRequestConstraints:
     """Test suite for MemberRequest validation and constraints."""
 
-    def test_member_request_requires_start_at(self, session: Session, member_factory):
-        """Test that a member request requires a start time."""
-        member = member_factory()
-        end = datetime.now(timezone.utc) + timedelta(days=1)
-
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(MemberRequest(end_at=end, member_id=member.id))
-            session.commit()
-
-    def test_member_request_requires_end_at(self, session: Session, member_factory):
-        """Test that a member request requires an end time."""
-        member = member_factory()
-        start = datetime.now(timezone.utc)
-
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(MemberRequest(start_at=start, member_id=member.id))
-            session.commit()
-
-    def test_member_request_requires_member_id(self, session: Session):
-        """Test that a member request requires a member_id."""
-        start = datetime.now(timezone.utc)
-        end = start + timedelta(days=1)
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"end_at": _FEB_3}, id="requires_start_at"),
+            pytest.param({"start_at": _FEB_1}, id="requires_end_at"),
+            pytest.param(
+                {
+                    "start_at": _FEB_1,
+                    "end_at": _FEB_3,
+                    "member_id": None,
+                },
+                id="requires_member_id",
+            ),
+        ],
+    )
+    def test_member_request_missing_field(
+        self, session: Session, member_factory, kwargs: dict
+    ):
+        """Test that a member request with a missing required field is rejected."""
+        # Arrange
+        if "member_id" not in kwargs:
+            kwargs = {**kwargs, "member_id": member_factory().id}
 
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(MemberRequest(start_at=start, end_at=end))
-            session.commit()
+        # Act & Assert
+        session.add(MemberRequest(**kwargs))
+        with pytest.raises(IntegrityError):  # NOT NULL constraint
+            session.flush()
+        session.rollback()
 
     def test_member_request_foreign_key_constraint(self, session: Session):
         """Test that member_id must reference an existing member."""
@@ -269,42 +303,44 @@ class TestMemberRequestConstraints:
             start_at=start, end_at=end, member_id=non_existent_member_id
         )
         session.add(request)
-        with pytest.raises(Exception):  # Foreign key constraint
-            session.commit()
+        with pytest.raises(IntegrityError):  # Foreign key constraint
+            session.flush()
 
 
 class TestMemberRequestQueryPatterns:
     """Test suite for common MemberRequest query patterns."""
 
     def test_query_requests_by_date_range(
-        self, session: Session, member_request_factory
+        self, session: Session, member_request_factory_bulk
     ):
         """Test querying member requests within a date range."""
         # Arrange
-        member_request_factory(
-            start_at=datetime(2025, 1, 10),
-            end_at=datetime(2025, 1, 12),
-            description="Early January",
-        )
-        member_request_factory(
-            start_at=datetime(2025, 1, 20),
-            end_at=datetime(2025, 1, 22),
-            description="Mid January",
-        )
-        member_request_factory(
-            start_at=datetime(2025, 2, 1),
-            end_at=datetime(2025, 2, 3),
-            description="Early February",
+        member_request_factory_bulk(
+            [
+                {
+                    "start_at": datetime(2025, 1, 10),
+                    "end_at": datetime(2025, 1, 12),
+                    "description": "Early January",
+                },
+                {
+                    "start_at": datetime(2025, 1, 20),
+                    "end_at": datetime(2025, 1, 22),
+                    "description": "Mid January",
+                },
+                {
+                    "start_at": _FEB_1,
+                    "end_at": _FEB_3,
+                    "description": "Early February",
+                },
+            ]
         )
 
         # Act - Query requests starting in January
-        statement = select(MemberRequest).where(
-            MemberRequest.start_at >= datetime(2025, 1, 1),
-            MemberRequest.start_at < datetime(2025, 2, 1),
-        )
-        results = session.exec(statement).all()
+        descriptions = session.exec(
+            _REQUEST_DESCRIPTIONS_STARTING_BETWEEN,
+            params={"lo": datetime(2025, 1, 1), "hi": _FEB_1},
+        ).all()
 
         # Assert
-        assert len(results) == 2
-        descriptions = {r.description for r in results}
-        assert descriptions == {"Early January", "Mid January"}
+        assert len(descriptions) == 2
+        assert set(descriptions) == {"Early January", "Mid January"}
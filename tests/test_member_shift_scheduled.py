@@ -5,10 +5,26 @@ Tests for MemberShiftScheduled link table CRUD operations and relationships.
 import uuid
 
 import pytest
+from sqlalchemy import bindparam, func
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from models import Member, MemberShiftScheduled, ShiftScheduled
 
+_LINK = select(MemberShiftScheduled).where(
+    MemberShiftScheduled.member_id == bindparam("member_id"),
+    MemberShiftScheduled.shift_scheduled_id == bindparam("shift_scheduled_id"),
+)
+_LINKS_BY_MEMBER = select(MemberShiftScheduled).where(
+    MemberShiftScheduled.member_id == bindparam("member_id")
+)
+_SHIFT_SCHEDULED_IDS_BY_MEMBER = select(MemberShiftScheduled.shift_scheduled_id).where(
+    MemberShiftScheduled.member_id == bindparam("member_id")
+)
+_MEMBER_IDS_BY_SHIFT_SCHEDULED = select(MemberShiftScheduled.member_id).where(
+    MemberShiftScheduled.shift_scheduled_id == bindparam("shift_scheduled_id")
+)
+
 
 class TestMemberShiftScheduledCRUD:
     """Test suite for MemberShiftScheduled Create, Read, Update, Delete operations."""
@@ -26,8 +42,7 @@ class TestMemberShiftScheduledCRUD:
             member_id=member.id, shift_scheduled_id=scheduled.id
         )
         session.add(link)
-        session.commit()
-        session.refresh(link)
+        session.flush()
 
         # Assert
         assert link.member_id == member.id
@@ -52,11 +67,13 @@ class TestMemberShiftScheduledCRUD:
         created = member_shift_scheduled_factory()
 
         # Act
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == created.member_id,
-            MemberShiftScheduled.shift_scheduled_id == created.shift_scheduled_id,
-        )
-        result = session.exec(statement).first()
+        result = session.exec(
+            _LINK,
+            params={
+                "member_id": created.member_id,
+                "shift_scheduled_id": created.shift_scheduled_id,
+            },
+        ).first()
 
         # Assert
         assert result is not None
@@ -73,11 +90,11 @@ class TestMemberShiftScheduledCRUD:
         member_shift_scheduled_factory()
 
         # Act
-        statement = select(MemberShiftScheduled)
-        results = session.exec(statement).all()
+        statement = select(func.count()).select_from(MemberShiftScheduled)
+        count = session.exec(statement).one()
 
         # Assert
-        assert len(results) == 3
+        assert count == 3
 
     def test_delete_member_shift_scheduled(
         self, session: Session, member_shift_scheduled_factory
@@ -90,14 +107,10 @@ class TestMemberShiftScheduledCRUD:
 
         # Act
         session.delete(link)
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == member_id,
-            MemberShiftScheduled.shift_scheduled_id == shift_id,
-        )
-        result = session.exec(statement).first()
+        result = session.get(MemberShiftScheduled, (member_id, shift_id))
         assert result is None
 
 
@@ -117,13 +130,10 @@ class TestMemberShiftScheduledRelationships:
             member_id=member.id, shift_scheduled_id=scheduled.id
         )
         session.add(link)
-        session.commit()
+        session.flush()
 
         # Assert - Verify link exists
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == member.id
-        )
-        result = session.exec(statement).first()
+        result = session.exec(_LINKS_BY_MEMBER, params={"member_id": member.id}).first()
         assert result is not None
         assert result.shift_scheduled_id == scheduled.id
 
@@ -138,26 +148,21 @@ class TestMemberShiftScheduledRelationships:
         scheduled = shift_scheduled_factory(description="Team Shift")
 
         # Act
-        link1 = MemberShiftScheduled(
-            member_id=member1.id, shift_scheduled_id=scheduled.id
-        )
-        link2 = MemberShiftScheduled(
-            member_id=member2.id, shift_scheduled_id=scheduled.id
-        )
-        link3 = MemberShiftScheduled(
-            member_id=member3.id, shift_scheduled_id=scheduled.id
+        session.bulk_insert_mappings(
+            MemberShiftScheduled,
+            [
+                {"member_id": member.id, "shift_scheduled_id": scheduled.id}
+                for member in (member1, member2, member3)
+            ],
         )
-        session.add_all([link1, link2, link3])
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.shift_scheduled_id == scheduled.id
-        )
-        results = session.exec(statement).all()
-        assert len(results) == 3
-        member_ids = {link.member_id for link in results}
-        assert member_ids == {member1.id, member2.id, member3.id}
+        member_ids = session.exec(
+            _MEMBER_IDS_BY_SHIFT_SCHEDULED, params={"shift_scheduled_id": scheduled.id}
+        ).all()
+        assert len(member_ids) == 3
+        assert set(member_ids) == {member1.id, member2.id, member3.id}
 
     def test_member_assigned_to_multiple_shifts(
         self, session: Session, member_factory, shift_scheduled_factory
@@ -170,20 +175,21 @@ class TestMemberShiftScheduledRelationships:
         shift3 = shift_scheduled_factory(description="Shift 3")
 
         # Act
-        link1 = MemberShiftScheduled(member_id=member.id, shift_scheduled_id=shift1.id)
-        link2 = MemberShiftScheduled(member_id=member.id, shift_scheduled_id=shift2.id)
-        link3 = MemberShiftScheduled(member_id=member.id, shift_scheduled_id=shift3.id)
-        session.add_all([link1, link2, link3])
-        session.commit()
+        session.bulk_insert_mappings(
+            MemberShiftScheduled,
+            [
+                {"member_id": member.id, "shift_scheduled_id": shift.id}
+                for shift in (shift1, shift2, shift3)
+            ],
+        )
+        session.flush()
 
         # Assert
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == member.id
-        )
-        results = session.exec(statement).all()
-        assert len(results) == 3
-        shift_ids = {link.shift_scheduled_id for link in results}
-        assert shift_ids == {shift1.id, shift2.id, shift3.id}
+        shift_ids = session.exec(
+            _SHIFT_SCHEDULED_IDS_BY_MEMBER, params={"member_id": member.id}
+        ).all()
+        assert len(shift_ids) == 3
+        assert set(shift_ids) == {shift1.id, shift2.id, shift3.id}
 
     def test_delete_link_does_not_delete_member(
         self, session: Session, member_factory, shift_scheduled_factory
@@ -196,15 +202,14 @@ class TestMemberShiftScheduledRelationships:
             member_id=member.id, shift_scheduled_id=scheduled.id
         )
         session.add(link)
-        session.commit()
+        session.flush()
 
         # Act
         session.delete(link)
-        session.commit()
+        session.flush()
 
         # Assert - Member should still exist
-        statement = select(Member).where(Member.id == member.id)
-        result = session.exec(statement).first()
+        result = session.get(Member, member.id)
         assert result is not None
         assert result.name == "Test Member"
 
@@ -219,15 +224,14 @@ class TestMemberShiftScheduledRelationships:
             member_id=member.id, shift_scheduled_id=scheduled.id
         )
         session.add(link)
-        session.commit()
+        session.flush()
 
         # Act
         session.delete(link)
-        session.commit()
+        session.flush()
 
         # Assert - Scheduled shift should still exist
-        statement = select(ShiftScheduled).where(ShiftScheduled.id == scheduled.id)
-        result = session.exec(statement).first()
+        result = session.get(ShiftScheduled, scheduled.id)
         assert result is not None
         assert result.description == "Test Shift"
 
@@ -246,8 +250,8 @@ class TestMemberShiftScheduledConstraints:
             member_id=non_existent_member_id, shift_scheduled_id=scheduled.id
         )
         session.add(link)
-        with pytest.raises(Exception):  # Foreign key constraint
-            session.commit()
+        with pytest.raises(IntegrityError):  # Foreign key constraint
+            session.flush()
 
     def test_link_foreign_key_shift_scheduled_id(
         self, session: Session, member_factory
@@ -260,15 +264,19 @@ class TestMemberShiftScheduledConstraints:
             member_id=member.id, shift_scheduled_id=non_existent_shift_id
         )
         session.add(link)
-        with pytest.raises(Exception):  # Foreign key constraint
-            session.commit()
+        with pytest.raises(IntegrityError):  # Foreign key constraint
+            session.flush()
 
 
 class TestMemberShiftScheduledQueryPatterns:
     """Test suite for common MemberShiftScheduled query patterns."""
 
     def test_query_shifts_for_member(
-        self, session: Session, member_factory, shift_scheduled_factory
+        self,
+        session: Session,
+        member_factory,
+        shift_scheduled_factory,
+        member_shift_scheduled_factory_bulk,
     ):
         """Test querying all shifts assigned to a specific member."""
         # Arrange
@@ -278,27 +286,28 @@ class TestMemberShiftScheduledQueryPatterns:
         shift_scheduled_factory(description="Shift 3")
 
         # Assign member to shifts 1 and 2
-        session.add(
-            MemberShiftScheduled(member_id=member.id, shift_scheduled_id=shift1.id)
-        )
-        session.add(
-            MemberShiftScheduled(member_id=member.id, shift_scheduled_id=shift2.id)
+        member_shift_scheduled_factory_bulk(
+            [
+                {"member_id": member.id, "shift_scheduled_id": shift1.id},
+                {"member_id": member.id, "shift_scheduled_id": shift2.id},
+            ]
         )
-        session.commit()
 
         # Act
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == member.id
-        )
-        results = session.exec(statement).all()
+        shift_ids = session.exec(
+            _SHIFT_SCHEDULED_IDS_BY_MEMBER, params={"member_id": member.id}
+        ).all()
 
         # Assert
-        assert len(results) == 2
-        shift_ids = {link.shift_scheduled_id for link in results}
-        assert shift_ids == {shift1.id, shift2.id}
+        assert len(shift_ids) == 2
+        assert set(shift_ids) == {shift1.id, shift2.id}
 
     def test_query_members_for_shift(
-        self, session: Session, member_factory, shift_scheduled_factory
+        self,
+        session: Session,
+        member_factory,
+        shift_scheduled_factory,
+        member_shift_scheduled_factory_bulk,
     ):
         """Test querying all members assigned to a specific shift."""
         # Arrange
@@ -308,30 +317,29 @@ class TestMemberShiftScheduledQueryPatterns:
         member3 = member_factory(name="M3", email="m3@example.com")
 
         # Assign members to shift
-        session.add(
-            MemberShiftScheduled(member_id=member1.id, shift_scheduled_id=shift.id)
-        )
-        session.add(
-            MemberShiftScheduled(member_id=member2.id, shift_scheduled_id=shift.id)
-        )
-        session.add(
-            MemberShiftScheduled(member_id=member3.id, shift_scheduled_id=shift.id)
+        member_shift_scheduled_factory_bulk(
+            [
+                {"member_id": member1.id, "shift_scheduled_id": shift.id},
+                {"member_id": member2.id, "shift_scheduled_id": shift.id},
+                {"member_id": member3.id, "shift_scheduled_id": shift.id},
+            ]
         )
-        session.commit()
 
         # Act
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.shift_scheduled_id == shift.id
-        )
-        results = session.exec(statement).all()
+        member_ids = session.exec(
+            _MEMBER_IDS_BY_SHIFT_SCHEDULED, params={"shift_scheduled_id": shift.id}
+        ).all()
 
         # Assert
-        assert len(results) == 3
-        member_ids = {link.member_id for link in results}
-        assert member_ids == {member1.id, member2.id, member3.id}
+        assert len(member_ids) == 3
+        assert set(member_ids) == {member1.id, member2.id, member3.id}
 
     def test_count_shifts_per_member(
-        self, session: Session, member_factory, shift_scheduled_factory
+        self,
+        session: Session,
+        member_factory,
+        shift_scheduled_factory,
+        member_shift_scheduled_factory_bulk,
     ):
         """Test counting how many shifts each member is assigned to."""
         # Arrange
@@ -342,35 +350,21 @@ class TestMemberShiftScheduledQueryPatterns:
         shift3 = shift_scheduled_factory(description="S3")
 
         # Member 1: 3 shifts, Member 2: 1 shift
-        session.add_all(
+        member_shift_scheduled_factory_bulk(
             [
-                MemberShiftScheduled(
-                    member_id=member1.id, shift_scheduled_id=shift1.id
-                ),
-                MemberShiftScheduled(
-                    member_id=member1.id, shift_scheduled_id=shift2.id
-                ),
-                MemberShiftScheduled(
-                    member_id=member1.id, shift_scheduled_id=shift3.id
-                ),
-                MemberShiftScheduled(
-                    member_id=member2.id, shift_scheduled_id=shift1.id
-                ),
+                {"member_id": member1.id, "shift_scheduled_id": shift1.id},
+                {"member_id": member1.id, "shift_scheduled_id": shift2.id},
+                {"member_id": member1.id, "shift_scheduled_id": shift3.id},
+                {"member_id": member2.id, "shift_scheduled_id": shift1.id},
             ]
         )
-        session.commit()
 
         # Act
-        statement1 = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == member1.id
-        )
-        member1_shifts = session.exec(statement1).all()
-
-        statement2 = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == member2.id
-        )
-        member2_shifts = session.exec(statement2).all()
+        statement = select(
+            MemberShiftScheduled.member_id,
+            func.count(MemberShiftScheduled.shift_scheduled_id),
+        ).group_by(MemberShiftScheduled.member_id)
+        counts = dict(session.exec(statement).all())
 
         # Assert
-        assert len(member1_shifts) == 3
-        assert len(member2_shifts) == 1
+        assert counts == {member1.id: 3, member2.id: 1}
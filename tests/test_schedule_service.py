@@ -0,0 +1,145 @@
+"""
+Tests for the scheduling model helpers.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from services.schedule_service import _find_request_overlaps
+
+
+class TestFindRequestOverlaps:
+    """Test suite for request/shift overlap detection."""
+
+    def test_request_overlapping_shift_is_detected(
+        self, session: Session, member_factory, member_request_factory, shift_factory
+    ):
+        """Test a request covering part of a shift is reported for that day."""
+        # Arrange
+        start = datetime(2025, 1, 20)  # Monday
+        member = member_factory()
+        shift = shift_factory(
+            seconds_since_midnight=9 * 3600,
+            duration_seconds=8 * 3600,
+            days=["0", "1", "2", "3", "4", "5", "6"],
+        )
+        member_request_factory(
+            member_id=member.id,
+            start_at=datetime(2025, 1, 21, 16, 0),
+            end_at=datetime(2025, 1, 21, 20, 0),
+        )
+        session.refresh(member)
+        days_dict = {k: start + timedelta(days=k) for k in range(7)}
+        day_weekdays = {k: str(d.weekday()) for k, d in days_dict.items()}
+
+        # Act
+        overlaps = _find_request_overlaps(
+            {0: member},
+            {0: shift},
+            days_dict,
+            day_weekdays,
+            start,
+            start + timedelta(days=7),
+        )
+
+        # Assert
+        assert overlaps == {(0, 1, 0)}
+
+    def test_shift_not_occurring_on_weekday_is_ignored(
+        self, session: Session, member_factory, member_request_factory, shift_factory
+    ):
+        """Test a request only overlaps shifts that run on that weekday."""
+        # Arrange
+        start = datetime(2025, 1, 20)  # Monday
+        member = member_factory()
+        shift = shift_factory(
+            seconds_since_midnight=9 * 3600,
+            duration_seconds=8 * 3600,
+            days=["0"],  # Mondays only
+        )
+        member_request_factory(
+            member_id=member.id,
+            start_at=datetime(2025, 1, 21, 0, 0),
+            end_at=datetime(2025, 1, 23, 0, 0),
+        )
+        session.refresh(member)
+        days_dict = {k: start + timedelta(days=k) for k in range(7)}
+        day_weekdays = {k: str(d.weekday()) for k, d in days_dict.items()}
+
+        # Act
+        overlaps = _find_request_overlaps(
+            {0: member},
+            {0: shift},
+            days_dict,
+            day_weekdays,
+            start,
+            start + timedelta(days=7),
+        )
+
+        # Assert
+        assert overlaps == set()
+
+    def test_overnight_shift_from_previous_day_is_detected(
+        self, session: Session, member_factory, member_request_factory, shift_factory
+    ):
+        """Test a shift starting the day before the request still overlaps it."""
+        # Arrange
+        start = datetime(2025, 1, 20)  # Monday
+        member = member_factory()
+        night_shift = shift_factory(
+            seconds_since_midnight=20 * 3600,
+            duration_seconds=12 * 3600,
+            days=["0", "1", "2", "3", "4", "5", "6"],
+        )
+        member_request_factory(
+            member_id=member.id,
+            start_at=datetime(2025, 1, 22, 2, 0),
+            end_at=datetime(2025, 1, 22, 6, 0),
+        )
+        session.refresh(member)
+        days_dict = {k: start + timedelta(days=k) for k in range(7)}
+        day_weekdays = {k: str(d.weekday()) for k, d in days_dict.items()}
+
+        # Act
+        overlaps = _find_request_overlaps(
+            {0: member},
+            {0: night_shift},
+            days_dict,
+            day_weekdays,
+            start,
+            start + timedelta(days=7),
+        )
+
+        # Assert
+        assert overlaps == {(0, 1, 0)}
+
+    def test_request_outside_window_is_ignored(
+        self, session: Session, member_factory, member_request_factory, shift_factory
+    ):
+        """Test requests entirely outside the scheduling window produce nothing."""
+        # Arrange
+        start = datetime(2025, 1, 20)
+        member = member_factory()
+        shift = shift_factory(days=["0", "1", "2", "3", "4", "5", "6"])
+        member_request_factory(
+            member_id=member.id,
+            start_at=datetime(2025, 2, 10, 0, 0),
+            end_at=datetime(2025, 2, 12, 0, 0),
+        )
+        session.refresh(member)
+        days_dict = {k: start + timedelta(days=k) for k in range(7)}
+        day_weekdays = {k: str(d.weekday()) for k, d in days_dict.items()}
+
+        # Act
+        overlaps = _find_request_overlaps(
+            {0: member},
+            {0: shift},
+            days_dict,
+            day_weekdays,
+            start,
+            start + timedelta(days=7),
+        )
+
+        # Assert
+        assert overlaps == set()
@@ -4,75 +4,124 @@ Tests for Shift model CRUD operations.
 
 import uuid
 from datetime import datetime
+from typing import Generator
 
 import pytest
+from sqlalchemy import bindparam, exists, func
 from sqlmodel import Session, select
 
 from models import Shift
 
+_SHIFT_BY_ID = select(Shift).where(Shift.id == bindparam("id"))
+_SHIFT_DESCRIPTIONS = select(Shift.description)
+# Unpack the days JSON array in SQL so the weekday filter runs in the database
+_SHIFT_DAYS = func.json_each(Shift.days).table_valued("value")
+_SHIFT_DESCRIPTIONS_ON_DAY = _SHIFT_DESCRIPTIONS.where(
+    exists().where(_SHIFT_DAYS.c.value == bindparam("day"))
+)
+_SHIFT_DESCRIPTIONS_STARTING_BETWEEN = _SHIFT_DESCRIPTIONS.where(
+    Shift.seconds_since_midnight >= bindparam("lo"),
+    Shift.seconds_since_midnight <= bindparam("hi"),
+)
+
+
+@pytest.fixture(scope="module")
+def shift_corpus(test_engine) -> Generator[list[Shift], None, None]:
+    """
+    Provide a fixed set of shifts shared by this module's read-only tests.
+
+    The shifts are committed once, outside the per-test transaction, and
+    deleted when the module finishes. Tests using it must not modify them.
+    """
+    shifts = [
+        Shift(
+            seconds_since_midnight=28800,  # 8:00 AM
+            days=["1"],
+            description="Monday morning",
+            members_required=1,
+        ),
+        Shift(
+            seconds_since_midnight=43200,  # 12:00 PM
+            days=["2"],
+            description="Tuesday afternoon",
+            members_required=1,
+        ),
+        Shift(
+            seconds_since_midnight=61200,  # 5:00 PM
+            days=["1", "3"],
+            description="Mon & Wed evening",
+            members_required=1,
+        ),
+    ]
+    with Session(test_engine, expire_on_commit=False) as session:
+        session.add_all(shifts)
+        session.commit()
+        yield shifts
+        for shift in shifts:
+            session.delete(shift)
+        session.commit()
+
 
 class TestShiftCRUD:
     """Test suite for Shift Create, Read, Update, Delete operations."""
 
-    def test_create_shift(self, session: Session):
-        """Test creating a new shift."""
-        # Arrange - 9:00 AM for 8 hours on Monday and Wednesday
-        seconds_9am = 9 * 3600
-        duration_8h = 8 * 3600
-
+    @pytest.mark.parametrize(
+        "kwargs,expected",
+        [
+            pytest.param(
+                {
+                    "seconds_since_midnight": 9 * 3600,
+                    "duration_seconds": 8 * 3600,
+                    "days": ["1", "3"],  # Monday, Wednesday
+                    "description": "Morning shift",
+                },
+                {
+                    "seconds_since_midnight": 9 * 3600,
+                    "duration_seconds": 8 * 3600,
+                    "days": ["1", "3"],
+                    "description": "Morning shift",
+                },
+                id="explicit",
+            ),
+            pytest.param(
+                {},
+                {
+                    "seconds_since_midnight": 0,  # Midnight
+                    "duration_seconds": 3600,  # 1 hour
+                    "days": [],
+                    "description": "",
+                },
+                id="defaults",
+            ),
+        ],
+    )
+    def test_create_shift(self, session: Session, kwargs, expected):
+        """Test creating a shift with explicit and default values."""
         # Act
-        shift = Shift(
-            seconds_since_midnight=seconds_9am,
-            duration_seconds=duration_8h,
-            days=["1", "3"],  # Monday, Wednesday
-            description="Morning shift",
-            members_required=1,
-        )
+        shift = Shift(members_required=1, **kwargs)
         session.add(shift)
-        session.commit()
-        session.refresh(shift)
+        session.flush()
 
         # Assert
-        assert shift.id is not None
         assert isinstance(shift.id, uuid.UUID)
-        assert shift.seconds_since_midnight == seconds_9am
-        assert shift.duration_seconds == duration_8h
-        assert shift.days == ["1", "3"]
-        assert shift.description == "Morning shift"
         assert isinstance(shift.created_at, datetime)
         assert isinstance(shift.updated_at, datetime)
+        assert shift.members_required == 1
+        for field, value in expected.items():
+            assert getattr(shift, field) == value
 
-    def test_create_shift_with_factory(self, shift_factory):
-        """Test creating a shift using the factory fixture."""
-        # Act
-        shift = shift_factory(
-            seconds_since_midnight=32400,  # 9:00 AM
-            duration_seconds=28800,  # 8 hours
-            days=["1", "2", "3", "4", "5"],  # Weekdays
-            description="Weekday morning shift",
-        )
-
-        # Assert
-        assert shift.id is not None
-        assert shift.seconds_since_midnight == 32400
-        assert shift.duration_seconds == 28800
-        assert len(shift.days) == 5
-        assert shift.description == "Weekday morning shift"
-
-    def test_create_shift_with_defaults(self, session: Session):
-        """Test creating a shift with default values."""
+    def test_create_shift_with_factory_defaults(self, shift_factory):
+        """Test the shift factory fills in its documented defaults."""
         # Act
-        shift = Shift(members_required=1)
-        session.add(shift)
-        session.commit()
-        session.refresh(shift)
+        shift = shift_factory()
 
         # Assert
-        assert shift.seconds_since_midnight == 0  # Midnight
-        assert shift.duration_seconds == 3600  # 1 hour
-        assert shift.days == []
-        assert shift.members_required == 1
+        assert isinstance(shift.id, uuid.UUID)
+        assert shift.seconds_since_midnight == 0
+        assert shift.duration_seconds == 3600
+        assert shift.days == ["1"]  # Monday
         assert shift.description == ""
+        assert shift.members_required == 1
 
     def test_read_shift(self, session: Session, shift_factory):
         """Test reading a shift from the database."""
@@ -85,8 +134,9 @@ class TestShiftCRUD:
         )
 
         # Act
-        statement = select(Shift).where(Shift.id == created_shift.id)
-        result = session.exec(statement).first()
+        result = session.exec(
+            _SHIFT_BY_ID, params={"id": created_shift.id}
+        ).one_or_none()
 
         # Assert
         assert result is not None
@@ -96,21 +146,18 @@ class TestShiftCRUD:
         assert result.days == ["0", "6"]
         assert result.description == "Weekend early shift"
 
-    def test_read_all_shifts(self, session: Session, shift_factory):
+    def test_read_all_shifts(self, session: Session, shift_corpus):
         """Test reading multiple shifts."""
-        # Arrange
-        shift_factory(description="Shift 1")
-        shift_factory(description="Shift 2")
-        shift_factory(description="Shift 3")
-
         # Act
-        statement = select(Shift)
-        results = session.exec(statement).all()
+        descriptions = session.exec(_SHIFT_DESCRIPTIONS).all()
 
         # Assert
-        assert len(results) == 3
-        descriptions = {shift.description for shift in results}
-        assert descriptions == {"Shift 1", "Shift 2", "Shift 3"}
+        assert len(descriptions) == 3
+        assert set(descriptions) == {
+            "Monday morning",
+            "Tuesday afternoon",
+            "Mon & Wed evening",
+        }
 
     def test_update_shift(self, session: Session, shift_factory):
         """Test updating a shift's information."""
@@ -129,8 +176,7 @@ class TestShiftCRUD:
         shift.days = ["1", "3", "5"]
         shift.description = "New description"
         session.add(shift)
-        session.commit()
-        session.refresh(shift)
+        session.flush()
 
         # Assert
         assert shift.id == original_id
@@ -147,11 +193,10 @@ class TestShiftCRUD:
 
         # Act
         session.delete(shift)
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(Shift).where(Shift.id == shift_id)
-        result = session.exec(statement).first()
+        result = session.get(Shift, shift_id)
         assert result is None
 
 
@@ -168,75 +213,74 @@ class TestShiftTimeHandling:
         shift_end_of_day = Shift(seconds_since_midnight=86399, members_required=1)
         session.add(shift_end_of_day)
 
-        session.commit()
-        session.refresh(shift_midnight)
-        session.refresh(shift_end_of_day)
+        session.flush()
 
         # Assert
         assert shift_midnight.seconds_since_midnight == 0
         assert shift_end_of_day.seconds_since_midnight == 86399
 
-    def test_shift_duration_positive_values(self, session: Session):
+    @pytest.mark.parametrize("duration_seconds", [0, -1])
+    def test_shift_duration_positive_values(self, duration_seconds: int):
         """Test that duration_seconds must be positive."""
-        # Duration must be positive integer (PositiveInt)
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(Shift(duration_seconds=0))
-            session.commit()
-
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(Shift(duration_seconds=-1))
-            session.commit()
-
-    def test_shift_various_durations(self, shift_factory):
+        # Rejected by the model validator when the shift is built
+        with pytest.raises(ValueError, match="duration_seconds"):
+            Shift(duration_seconds=duration_seconds)
+
+    @pytest.mark.parametrize(
+        "duration_seconds",
+        [
+            pytest.param(1800, id="30_minutes"),
+            pytest.param(43200, id="12_hours"),
+            pytest.param(86400, id="24_hours"),
+        ],
+    )
+    def test_shift_various_durations(self, shift_factory, duration_seconds: int):
         """Test shifts with various duration values."""
-        # 30 minute shift
-        shift_30min = shift_factory(duration_seconds=1800)
-        assert shift_30min.duration_seconds == 1800
-
-        # 12 hour shift
-        shift_12h = shift_factory(duration_seconds=43200)
-        assert shift_12h.duration_seconds == 43200
-
-        # 24 hour shift
-        shift_24h = shift_factory(duration_seconds=86400)
-        assert shift_24h.duration_seconds == 86400
+        shift = shift_factory(duration_seconds=duration_seconds)
+        assert shift.duration_seconds == duration_seconds
 
 
 class TestShiftDaysHandling:
     """Test suite for Shift days field functionality."""
 
-    def test_shift_single_day(self, shift_factory):
-        """Test shift with a single day."""
-        shift = shift_factory(days=["2"])  # Tuesday only
-        assert shift.days == ["2"]
-        assert len(shift.days) == 1
-
-    def test_shift_multiple_days(self, shift_factory):
-        """Test shift with multiple days."""
-        shift = shift_factory(days=["1", "2", "3", "4", "5"])  # Weekdays
-        assert len(shift.days) == 5
-        assert "1" in shift.days
-        assert "5" in shift.days
-
-    def test_shift_all_days(self, shift_factory):
-        """Test shift with all days of the week."""
-        all_days = ["0", "1", "2", "3", "4", "5", "6"]
-        shift = shift_factory(days=all_days)
-        assert len(shift.days) == 7
-        assert shift.days == all_days
-
-    def test_shift_weekend_only(self, shift_factory):
-        """Test shift for weekend only."""
-        shift = shift_factory(days=["0", "6"])  # Sunday, Saturday
-        assert len(shift.days) == 2
-        assert "0" in shift.days
-        assert "6" in shift.days
-
-    def test_shift_empty_days(self, shift_factory):
-        """Test shift with no days specified."""
-        shift = shift_factory(days=[])
-        assert shift.days == []
-        assert len(shift.days) == 0
+    @pytest.mark.parametrize(
+        ("days", "days_mask"),
+        [
+            pytest.param(["2"], 0b0000100, id="single_day"),  # Tuesday only
+            pytest.param(["1", "2", "3", "4", "5"], 0b0111110, id="weekdays"),
+            pytest.param(["0", "1", "2", "3", "4", "5", "6"], 0b1111111, id="all_days"),
+            pytest.param(["0", "6"], 0b1000001, id="weekend_only"),
+            pytest.param([], 0, id="empty"),
+        ],
+    )
+    def test_shift_days(self, shift_factory, days: list[str], days_mask: int):
+        """Test shifts keep the exact set of days they were given."""
+        shift = shift_factory(days=days)
+        assert shift.days == days
+        assert len(shift.days) == len(days)
+        assert Shift.days_to_mask(shift.days) == days_mask
+
+    @pytest.mark.parametrize(
+        "days",
+        [
+            pytest.param(["7"], id="out_of_range"),
+            pytest.param(["1", "Mon"], id="name"),
+            pytest.param([1], id="int"),
+        ],
+    )
+    def test_shift_days_must_be_weekdays(self, days: list):
+        """Test days outside "0".."6" are rejected at construction."""
+        with pytest.raises(ValueError, match="days"):
+            Shift(members_required=1, days=days)
+
+    def test_shift_days_update_is_validated(self, shift_factory):
+        """Test reassigning days goes through the same weekday check."""
+        # Arrange
+        shift = shift_factory(days=["1"])
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="days"):
+            shift.days = ["0", "8"]
 
     def test_shift_days_stored_as_json(self, session: Session, shift_factory):
         """Test that days are properly stored and retrieved as JSON."""
@@ -245,8 +289,9 @@ class TestShiftDaysHandling:
         shift = shift_factory(days=days)
 
         # Act - retrieve from database
-        statement = select(Shift).where(Shift.id == shift.id)
-        retrieved_shift = session.exec(statement).first()
+        retrieved_shift = session.exec(
+            _SHIFT_BY_ID, params={"id": shift.id}
+        ).one_or_none()
 
         # Assert
         assert retrieved_shift.days == days
@@ -256,18 +301,16 @@ class TestShiftDaysHandling:
 class TestShiftValidation:
     """Test suite for Shift validation and constraints."""
 
-    def test_shift_seconds_since_midnight_must_be_non_negative(self, session: Session):
+    def test_shift_seconds_since_midnight_must_be_non_negative(self):
         """Test that seconds_since_midnight cannot be negative."""
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(Shift(seconds_since_midnight=-1))
-            session.commit()
+        with pytest.raises(ValueError, match="seconds_since_midnight"):
+            Shift(seconds_since_midnight=-1)
 
     def test_shift_description_defaults_to_empty(self, session: Session):
         """Test that description defaults to empty string."""
         shift = Shift(members_required=1)
         session.add(shift)
-        session.commit()
-        session.refresh(shift)
+        session.flush()
 
         assert shift.description == ""
 
@@ -286,47 +329,27 @@ class TestShiftValidation:
 class TestShiftQueryPatterns:
     """Test suite for common Shift query patterns."""
 
-    def test_query_shifts_by_day(self, session: Session, shift_factory):
+    def test_query_shifts_by_day(self, session: Session, shift_corpus, count_queries):
         """Test querying shifts that occur on a specific day."""
-        # Arrange
-        shift_factory(days=["1"], description="Monday only")
-        shift_factory(days=["2"], description="Tuesday only")
-        shift_factory(days=["1", "3"], description="Mon & Wed")
-
         # Act - Find all shifts that include Monday
-        statement = select(Shift)
-        all_shifts = session.exec(statement).all()
-        monday_shifts = [s for s in all_shifts if "1" in s.days]
+        with count_queries() as queries:
+            descriptions = session.exec(
+                _SHIFT_DESCRIPTIONS_ON_DAY, params={"day": "1"}
+            ).all()
 
         # Assert
-        assert len(monday_shifts) == 2
-        descriptions = {s.description for s in monday_shifts}
-        assert descriptions == {"Monday only", "Mon & Wed"}
+        assert len(queries) == 1
+        assert len(descriptions) == 2
+        assert set(descriptions) == {"Monday morning", "Mon & Wed evening"}
 
-    def test_query_shifts_by_time_range(self, session: Session, shift_factory):
+    def test_query_shifts_by_time_range(self, session: Session, shift_corpus):
         """Test querying shifts by time of day."""
-        # Arrange - Create morning, afternoon, and evening shifts
-        shift_factory(
-            seconds_since_midnight=28800,  # 8:00 AM
-            description="Morning",
-        )
-        shift_factory(
-            seconds_since_midnight=43200,  # 12:00 PM
-            description="Afternoon",
-        )
-        shift_factory(
-            seconds_since_midnight=61200,  # 5:00 PM
-            description="Evening",
-        )
-
         # Act - Query shifts starting between 8 AM and 1 PM
-        statement = select(Shift).where(
-            Shift.seconds_since_midnight >= 28800,  # >= 8:00 AM
-            Shift.seconds_since_midnight <= 46800,  # <= 1:00 PM
-        )
-        results = session.exec(statement).all()
+        descriptions = session.exec(
+            _SHIFT_DESCRIPTIONS_STARTING_BETWEEN,
+            params={"lo": 28800, "hi": 46800},  # 8:00 AM to 1:00 PM
+        ).all()
 
         # Assert
-        assert len(results) == 2
-        descriptions = {s.description for s in results}
-        assert descriptions == {"Morning", "Afternoon"}
+        assert len(descriptions) == 2
+        assert set(descriptions) == {"Monday morning", "Tuesday afternoon"}
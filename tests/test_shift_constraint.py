@@ -5,9 +5,25 @@ Tests for ShiftConstraint model CRUD operations and relationships.
 import uuid
 
 import pytest
+from sqlalchemy import bindparam, func, insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
-from models import ShiftConstraint
+from models import Shift, ShiftConstraint
+
+_CONSTRAINTS = select(ShiftConstraint)
+_CONSTRAINT_COUNT = select(func.count()).select_from(ShiftConstraint)
+_CONSTRAINT_WITHIN_VALUES = select(ShiftConstraint.within_last_shifts)
+_CONSTRAINT_BY_PAIR = _CONSTRAINTS.where(
+    ShiftConstraint.shift_id == bindparam("shift_id"),
+    ShiftConstraint.linked_shift_id == bindparam("linked_shift_id"),
+)
+_CONSTRAINTS_FROM_SHIFT = _CONSTRAINTS.where(
+    ShiftConstraint.shift_id == bindparam("shift_id")
+)
+_CONSTRAINTS_TO_SHIFT = _CONSTRAINTS.where(
+    ShiftConstraint.linked_shift_id == bindparam("linked_shift_id")
+)
 
 
 class TestShiftConstraintCRUD:
@@ -24,8 +40,7 @@ class TestShiftConstraintCRUD:
             shift_id=shift1.id, linked_shift_id=shift2.id, within_last_shifts=2
         )
         session.add(constraint)
-        session.commit()
-        session.refresh(constraint)
+        session.flush()
 
         # Assert
         assert constraint.shift_id == shift1.id
@@ -53,8 +68,7 @@ class TestShiftConstraintCRUD:
         # Act
         constraint = ShiftConstraint(shift_id=shift1.id, linked_shift_id=shift2.id)
         session.add(constraint)
-        session.commit()
-        session.refresh(constraint)
+        session.flush()
 
         # Assert
         assert constraint.within_last_shifts == 1  # Default value
@@ -65,11 +79,13 @@ class TestShiftConstraintCRUD:
         created = shift_constraint_factory(within_last_shifts=5)
 
         # Act
-        statement = select(ShiftConstraint).where(
-            ShiftConstraint.shift_id == created.shift_id,
-            ShiftConstraint.linked_shift_id == created.linked_shift_id,
-        )
-        result = session.exec(statement).first()
+        result = session.exec(
+            _CONSTRAINT_BY_PAIR,
+            params={
+                "shift_id": created.shift_id,
+                "linked_shift_id": created.linked_shift_id,
+            },
+        ).one_or_none()
 
         # Assert
         assert result is not None
@@ -78,22 +94,24 @@ class TestShiftConstraintCRUD:
         assert result.within_last_shifts == 5
 
     def test_read_all_shift_constraints(
-        self, session: Session, shift_constraint_factory
+        self, session: Session, shift_constraint_factory_bulk
     ):
         """Test reading multiple shift constraints."""
         # Arrange
-        shift_constraint_factory(within_last_shifts=1)
-        shift_constraint_factory(within_last_shifts=2)
-        shift_constraint_factory(within_last_shifts=3)
+        shift_constraint_factory_bulk(
+            [
+                {"within_last_shifts": 1},
+                {"within_last_shifts": 2},
+                {"within_last_shifts": 3},
+            ]
+        )
 
         # Act
-        statement = select(ShiftConstraint)
-        results = session.exec(statement).all()
+        within_values = session.exec(_CONSTRAINT_WITHIN_VALUES).all()
 
         # Assert
-        assert len(results) == 3
-        within_values = {c.within_last_shifts for c in results}
-        assert within_values == {1, 2, 3}
+        assert len(within_values) == 3
+        assert set(within_values) == {1, 2, 3}
 
     def test_update_shift_constraint(self, session: Session, shift_constraint_factory):
         """Test updating a shift constraint's within_last_shifts value."""
@@ -105,8 +123,7 @@ class TestShiftConstraintCRUD:
         # Act
         constraint.within_last_shifts = 5
         session.add(constraint)
-        session.commit()
-        session.refresh(constraint)
+        session.flush()
 
         # Assert
         assert constraint.shift_id == original_shift_id
@@ -122,14 +139,10 @@ class TestShiftConstraintCRUD:
 
         # Act
         session.delete(constraint)
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(ShiftConstraint).where(
-            ShiftConstraint.shift_id == shift_id,
-            ShiftConstraint.linked_shift_id == linked_id,
-        )
-        result = session.exec(statement).first()
+        result = session.get(ShiftConstraint, (shift_id, linked_id))
         assert result is None
 
 
@@ -161,13 +174,19 @@ class TestShiftConstraintRelationships:
         assert constraint.shift_id == morning_shift.id
         assert constraint.linked_shift_id == evening_shift.id
 
-    def test_shift_can_have_multiple_constraints(self, session: Session, shift_factory):
+    def test_shift_can_have_multiple_constraints(
+        self, session: Session, shift_factory_bulk
+    ):
         """Test that a shift can have multiple constraints linking to different shifts."""
         # Arrange
-        primary_shift = shift_factory(description="Primary")
-        linked1 = shift_factory(description="Linked 1")
-        linked2 = shift_factory(description="Linked 2")
-        linked3 = shift_factory(description="Linked 3")
+        primary_shift, linked1, linked2, linked3 = shift_factory_bulk(
+            [
+                {"description": "Primary"},
+                {"description": "Linked 1"},
+                {"description": "Linked 2"},
+                {"description": "Linked 3"},
+            ]
+        )
 
         # Act - Create multiple constraints from primary shift
         constraint1 = ShiftConstraint(
@@ -180,23 +199,26 @@ class TestShiftConstraintRelationships:
             shift_id=primary_shift.id, linked_shift_id=linked3.id, within_last_shifts=3
         )
         session.add_all([constraint1, constraint2, constraint3])
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(ShiftConstraint).where(
-            ShiftConstraint.shift_id == primary_shift.id
-        )
-        results = session.exec(statement).all()
+        results = session.exec(
+            _CONSTRAINTS_FROM_SHIFT, params={"shift_id": primary_shift.id}
+        ).all()
         assert len(results) == 3
 
     def test_shift_can_be_linked_by_multiple_shifts(
-        self, session: Session, shift_factory
+        self, session: Session, shift_factory_bulk
     ):
         """Test that a shift can be the target of multiple constraints."""
         # Arrange
-        target_shift = shift_factory(description="Target")
-        source1 = shift_factory(description="Source 1")
-        source2 = shift_factory(description="Source 2")
+        target_shift, source1, source2 = shift_factory_bulk(
+            [
+                {"description": "Target"},
+                {"description": "Source 1"},
+                {"description": "Source 2"},
+            ]
+        )
 
         # Act
         constraint1 = ShiftConstraint(
@@ -206,13 +228,12 @@ class TestShiftConstraintRelationships:
             shift_id=source2.id, linked_shift_id=target_shift.id, within_last_shifts=2
         )
         session.add_all([constraint1, constraint2])
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(ShiftConstraint).where(
-            ShiftConstraint.linked_shift_id == target_shift.id
-        )
-        results = session.exec(statement).all()
+        results = session.exec(
+            _CONSTRAINTS_TO_SHIFT, params={"linked_shift_id": target_shift.id}
+        ).all()
         assert len(results) == 2
 
     def test_bidirectional_constraints(self, session: Session, shift_factory):
@@ -229,12 +250,10 @@ class TestShiftConstraintRelationships:
             shift_id=shift_b.id, linked_shift_id=shift_a.id, within_last_shifts=1
         )
         session.add_all([constraint_a_to_b, constraint_b_to_a])
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(ShiftConstraint)
-        results = session.exec(statement).all()
-        assert len(results) == 2
+        assert session.exec(_CONSTRAINT_COUNT).one() == 2
 
     def test_self_referential_constraint(self, session: Session, shift_factory):
         """Test creating a constraint where a shift references itself."""
@@ -246,14 +265,13 @@ class TestShiftConstraintRelationships:
             shift_id=shift.id, linked_shift_id=shift.id, within_last_shifts=2
         )
         session.add(constraint)
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(ShiftConstraint).where(
-            ShiftConstraint.shift_id == shift.id,
-            ShiftConstraint.linked_shift_id == shift.id,
-        )
-        result = session.exec(statement).first()
+        result = session.exec(
+            _CONSTRAINT_BY_PAIR,
+            params={"shift_id": shift.id, "linked_shift_id": shift.id},
+        ).one_or_none()
         assert result is not None
         assert result.shift_id == shift.id
         assert result.linked_shift_id == shift.id
@@ -274,18 +292,14 @@ class TestShiftConstraintValidation:
             shift_id=shift1.id, linked_shift_id=shift2.id, within_last_shifts=0
         )
         session.add(constraint_zero)
-        session.commit()
-        session.refresh(constraint_zero)
+        session.flush()
         assert constraint_zero.within_last_shifts == 0
 
-        # Test negative value is rejected
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(
-                ShiftConstraint(
-                    shift_id=shift1.id, linked_shift_id=shift2.id, within_last_shifts=-1
-                )
+        # Test negative value is rejected when the constraint is built
+        with pytest.raises(ValueError, match="within_last_shifts"):
+            ShiftConstraint(
+                shift_id=shift1.id, linked_shift_id=shift2.id, within_last_shifts=-1
             )
-            session.commit()
 
     def test_shift_constraint_foreign_key_shift_id(
         self, session: Session, shift_factory
@@ -298,8 +312,8 @@ class TestShiftConstraintValidation:
             shift_id=non_existent_id, linked_shift_id=shift.id, within_last_shifts=1
         )
         session.add(constraint)
-        with pytest.raises(Exception):  # Foreign key constraint
-            session.commit()
+        with pytest.raises(IntegrityError):  # Foreign key constraint
+            session.flush()
 
     def test_shift_constraint_foreign_key_linked_shift_id(
         self, session: Session, shift_factory
@@ -312,15 +326,15 @@ class TestShiftConstraintValidation:
             shift_id=shift.id, linked_shift_id=non_existent_id, within_last_shifts=1
         )
         session.add(constraint)
-        with pytest.raises(Exception):  # Foreign key constraint
-            session.commit()
+        with pytest.raises(IntegrityError):  # Foreign key constraint
+            session.flush()
 
 
 class TestShiftConstraintQueryPatterns:
     """Test suite for common ShiftConstraint query patterns."""
 
     def test_query_constraints_for_shift(
-        self, session: Session, shift_factory, shift_constraint_factory
+        self, session: Session, shift_factory, shift_constraint_factory, count_queries
     ):
         """Test querying all constraints for a specific shift."""
         # Arrange
@@ -340,15 +354,16 @@ class TestShiftConstraintQueryPatterns:
         shift_constraint_factory(shift_id=other.id, linked_shift_id=linked1.id)
 
         # Act
-        statement = select(ShiftConstraint).where(
+        statement = select(ShiftConstraint.linked_shift_id).where(
             ShiftConstraint.shift_id == primary.id
         )
-        results = session.exec(statement).all()
+        with count_queries() as queries:
+            linked_ids = session.exec(statement).all()
 
         # Assert
-        assert len(results) == 2
-        linked_ids = {c.linked_shift_id for c in results}
-        assert linked_ids == {linked1.id, linked2.id}
+        assert len(queries) == 1
+        assert len(linked_ids) == 2
+        assert set(linked_ids) == {linked1.id, linked2.id}
 
     def test_query_constraints_by_within_last_shifts(
         self, session: Session, shift_constraint_factory
@@ -361,156 +376,121 @@ class TestShiftConstraintQueryPatterns:
         shift_constraint_factory(within_last_shifts=3)
 
         # Act
-        statement = select(ShiftConstraint).where(
-            ShiftConstraint.within_last_shifts == 1
+        statement = (
+            select(func.count())
+            .select_from(ShiftConstraint)
+            .where(ShiftConstraint.within_last_shifts == 1)
         )
-        results = session.exec(statement).all()
+        count = session.exec(statement).one()
 
         # Assert
-        assert len(results) == 2
-        assert all(c.within_last_shifts == 1 for c in results)
+        assert count == 2
 
     def test_query_constraints_by_threshold(
-        self, session: Session, shift_constraint_factory
+        self, session: Session, shift_constraint_factory_bulk, count_queries
     ):
         """Test querying constraints with within_last_shifts above a threshold."""
         # Arrange
-        shift_constraint_factory(within_last_shifts=1)
-        shift_constraint_factory(within_last_shifts=2)
-        shift_constraint_factory(within_last_shifts=3)
-        shift_constraint_factory(within_last_shifts=5)
+        shift_constraint_factory_bulk(
+            [
+                {"within_last_shifts": 1},
+                {"within_last_shifts": 2},
+                {"within_last_shifts": 3},
+                {"within_last_shifts": 5},
+            ]
+        )
 
         # Act - Find constraints with within_last_shifts >= 3
-        statement = select(ShiftConstraint).where(
+        statement = select(ShiftConstraint.within_last_shifts).where(
             ShiftConstraint.within_last_shifts >= 3
         )
-        results = session.exec(statement).all()
+        with count_queries() as queries:
+            within_values = session.exec(statement).all()
 
         # Assert
-        assert len(results) == 2
-        within_values = {c.within_last_shifts for c in results}
-        assert within_values == {3, 5}
-
-
-class TestShiftConstraintAutoGeneration:
-    """Test suite for automatic constraint generation from overlapping shifts."""
-
-    def test_detect_same_day_time_overlap_no_overlap(self):
-        """Test that non-overlapping time ranges return False."""
-        # Morning shift: 8am-12pm (28800-43200)
-        # Afternoon shift: 1pm-5pm (46800-61200)
-        overlap = ShiftConstraint._shifts_overlap_on_day(
-            start_a=28800, duration_a=14400, start_b=46800, duration_b=14400
-        )
-        assert overlap is False
-
-    def test_detect_same_day_time_overlap_partial(self):
-        """Test that partially overlapping time ranges return True."""
-        # Shift A: 9am-5pm (32400-61200)
-        # Shift B: 3pm-11pm (54000-82800)
-        # Overlap: 3pm-5pm
-        overlap = ShiftConstraint._shifts_overlap_on_day(
-            start_a=32400, duration_a=28800, start_b=54000, duration_b=28800
-        )
-        assert overlap is True
-
-    def test_detect_same_day_time_overlap_complete_containment(self):
-        """Test that one shift completely contains another."""
-        # Shift A: 8am-8pm (28800-72000) - 12 hours
-        # Shift B: 10am-2pm (36000-50400) - 4 hours
+        assert len(queries) == 1
+        assert len(within_values) == 2
+        assert set(within_values) == {3, 5}
+
+
+class TestShiftConstraintOverlapDetection:
+    """Test suite for the pure overlap helpers; none of these touch the database."""
+
+    @pytest.mark.parametrize(
+        ("start_a", "duration_a", "start_b", "duration_b", "expected"),
+        [
+            # 8am-12pm vs 1pm-5pm
+            pytest.param(28800, 14400, 46800, 14400, False, id="no_overlap"),
+            # 9am-5pm vs 3pm-11pm, overlapping 3pm-5pm
+            pytest.param(32400, 28800, 54000, 28800, True, id="partial"),
+            # 8am-8pm contains 10am-2pm
+            pytest.param(28800, 43200, 36000, 14400, True, id="containment"),
+            # Both 9am-5pm
+            pytest.param(32400, 28800, 32400, 28800, True, id="identical"),
+            # 9am-5pm then 5pm-9pm
+            pytest.param(32400, 28800, 61200, 14400, False, id="adjacent"),
+        ],
+    )
+    def test_detect_same_day_time_overlap(
+        self,
+        start_a: int,
+        duration_a: int,
+        start_b: int,
+        duration_b: int,
+        expected: bool,
+    ):
+        """Test same-day overlap detection between two time ranges."""
         overlap = ShiftConstraint._shifts_overlap_on_day(
-            start_a=28800, duration_a=43200, start_b=36000, duration_b=14400
+            start_a=start_a,
+            duration_a=duration_a,
+            start_b=start_b,
+            duration_b=duration_b,
+        )
+        assert overlap is expected
+
+    @pytest.mark.parametrize(
+        ("start_a", "duration_a", "start_b", "day_a", "day_b", "expected"),
+        [
+            # Monday 11pm-1am into Tuesday 12am
+            pytest.param(82800, 7200, 0, 1, 2, (True, True), id="crosses_midnight"),
+            # Monday 9am-5pm, Tuesday 9am
+            pytest.param(
+                32400, 28800, 32400, 1, 2, (False, False), id="no_midnight_crossing"
+            ),
+            # Monday 11pm-12:30am, Tuesday 8am
+            pytest.param(
+                82800, 5400, 28800, 1, 2, (True, False), id="crosses_but_no_overlap"
+            ),
+            # Sunday 11pm-1am into Monday 12am
+            pytest.param(82800, 7200, 0, 0, 1, (True, True), id="sunday_to_monday"),
+            # Monday 11pm-1am, Wednesday 12am
+            pytest.param(
+                82800, 7200, 0, 1, 3, (True, False), id="not_consecutive_days"
+            ),
+        ],
+    )
+    def test_detect_cross_day_overlap(
+        self,
+        start_a: int,
+        duration_a: int,
+        start_b: int,
+        day_a: int,
+        day_b: int,
+        expected: tuple[bool, bool],
+    ):
+        """Test detection of a shift spilling past midnight into the next day."""
+        result = ShiftConstraint._check_cross_day_overlap(
+            start_a=start_a,
+            duration_a=duration_a,
+            start_b=start_b,
+            day_a=day_a,
+            day_b=day_b,
         )
-        assert overlap is True
+        assert result == expected
 
-    def test_detect_same_day_time_overlap_identical(self):
-        """Test that identical time ranges overlap."""
-        # Both shifts: 9am-5pm
-        overlap = ShiftConstraint._shifts_overlap_on_day(
-            start_a=32400, duration_a=28800, start_b=32400, duration_b=28800
-        )
-        assert overlap is True
 
-    def test_detect_same_day_time_overlap_adjacent_no_overlap(self):
-        """Test that adjacent but non-overlapping shifts return False."""
-        # Shift A: 9am-5pm (ends at 61200)
-        # Shift B: 5pm-9pm (starts at 61200)
-        overlap = ShiftConstraint._shifts_overlap_on_day(
-            start_a=32400, duration_a=28800, start_b=61200, duration_b=14400
-        )
-        assert overlap is False
-
-    def test_detect_cross_day_overlap_shift_crosses_midnight(self):
-        """Test detecting when a shift crosses midnight into another shift."""
-        # Shift A: Monday 11pm-1am (82800 + 7200 = 90000, crosses midnight)
-        # Shift B: Tuesday 12am-8am (0 + 28800 = 28800)
-        # Next day from Monday (1) is Tuesday (2)
-        crosses, overlaps_next = ShiftConstraint._check_cross_day_overlap(
-            start_a=82800,
-            duration_a=7200,  # 11pm for 2 hours
-            start_b=0,  # 12am
-            day_a=1,
-            day_b=2,  # Monday -> Tuesday
-        )
-        assert crosses is True
-        assert overlaps_next is True
-
-    def test_detect_cross_day_overlap_no_midnight_crossing(self):
-        """Test that shifts not crossing midnight return False."""
-        # Shift A: Monday 9am-5pm (no midnight crossing)
-        # Shift B: Tuesday 9am-5pm
-        crosses, overlaps_next = ShiftConstraint._check_cross_day_overlap(
-            start_a=32400,
-            duration_a=28800,  # 9am for 8 hours
-            start_b=32400,
-            day_a=1,
-            day_b=2,
-        )
-        assert crosses is False
-        assert overlaps_next is False
-
-    def test_detect_cross_day_overlap_crosses_but_no_overlap(self):
-        """Test shift crosses midnight but doesn't overlap next shift."""
-        # Shift A: Monday 11pm-12:30am (82800 + 5400 = 88200, ends at 12:30am)
-        # Shift B: Tuesday 8am-4pm (starts at 28800)
-        # Spillover ends before Shift B starts
-        crosses, overlaps_next = ShiftConstraint._check_cross_day_overlap(
-            start_a=82800,
-            duration_a=5400,  # 11pm for 1.5 hours
-            start_b=28800,  # 8am
-            day_a=1,
-            day_b=2,
-        )
-        assert crosses is True
-        assert overlaps_next is False
-
-    def test_detect_cross_day_overlap_sunday_to_monday(self):
-        """Test wraparound from Sunday (0) to Monday (1)."""
-        # Shift A: Sunday 11pm-1am
-        # Shift B: Monday 12am-8am
-        crosses, overlaps_next = ShiftConstraint._check_cross_day_overlap(
-            start_a=82800,
-            duration_a=7200,
-            start_b=0,
-            day_a=0,
-            day_b=1,  # Sunday -> Monday
-        )
-        assert crosses is True
-        assert overlaps_next is True
-
-    def test_detect_cross_day_overlap_not_consecutive_days(self):
-        """Test that non-consecutive days return False for overlap."""
-        # Shift A: Monday 11pm-1am (crosses into Tuesday)
-        # Shift B: Wednesday 12am-8am (not the next day)
-        crosses, overlaps_next = ShiftConstraint._check_cross_day_overlap(
-            start_a=82800,
-            duration_a=7200,
-            start_b=0,
-            day_a=1,
-            day_b=3,  # Monday -> Wednesday (not consecutive)
-        )
-        assert crosses is True
-        assert overlaps_next is False
+class TestShiftConstraintAutoGeneration:
+    """Test suite for automatic constraint generation from overlapping shifts."""
 
     def test_generate_from_overlaps_same_day_bidirectional(
         self, session: Session, shift_factory
@@ -539,26 +519,21 @@ class TestShiftConstraintAutoGeneration:
         assert result["unchanged"] == 0
 
         # Verify bidirectional constraints created
-        constraints = session.exec(select(ShiftConstraint)).all()
-        assert len(constraints) == 2
+        assert session.exec(_CONSTRAINT_COUNT).one() == 2
 
         # Check constraint A -> B
         constraint_ab = session.exec(
-            select(ShiftConstraint).where(
-                ShiftConstraint.shift_id == shift_a.id,
-                ShiftConstraint.linked_shift_id == shift_b.id,
-            )
-        ).first()
+            _CONSTRAINT_BY_PAIR,
+            params={"shift_id": shift_a.id, "linked_shift_id": shift_b.id},
+        ).one_or_none()
         assert constraint_ab is not None
         assert constraint_ab.within_last_shifts == 0
 
         # Check constraint B -> A
         constraint_ba = session.exec(
-            select(ShiftConstraint).where(
-                ShiftConstraint.shift_id == shift_b.id,
-                ShiftConstraint.linked_shift_id == shift_a.id,
-            )
-        ).first()
+            _CONSTRAINT_BY_PAIR,
+            params={"shift_id": shift_b.id, "linked_shift_id": shift_a.id},
+        ).one_or_none()
         assert constraint_ba is not None
         assert constraint_ba.within_last_shifts == 0
 
@@ -590,21 +565,17 @@ class TestShiftConstraintAutoGeneration:
 
         # Verify unidirectional constraint A -> B
         constraint_ab = session.exec(
-            select(ShiftConstraint).where(
-                ShiftConstraint.shift_id == shift_a.id,
-                ShiftConstraint.linked_shift_id == shift_b.id,
-            )
-        ).first()
+            _CONSTRAINT_BY_PAIR,
+            params={"shift_id": shift_a.id, "linked_shift_id": shift_b.id},
+        ).one_or_none()
         assert constraint_ab is not None
         assert constraint_ab.within_last_shifts == 1
 
         # Verify no reverse constraint B -> A
         constraint_ba = session.exec(
-            select(ShiftConstraint).where(
-                ShiftConstraint.shift_id == shift_b.id,
-                ShiftConstraint.linked_shift_id == shift_a.id,
-            )
-        ).first()
+            _CONSTRAINT_BY_PAIR,
+            params={"shift_id": shift_b.id, "linked_shift_id": shift_a.id},
+        ).one_or_none()
         assert constraint_ba is None
 
     def test_generate_from_overlaps_updates_existing_constraints(
@@ -642,11 +613,9 @@ class TestShiftConstraintAutoGeneration:
 
         # Verify updated constraint has correct value
         constraint_ab = session.exec(
-            select(ShiftConstraint).where(
-                ShiftConstraint.shift_id == shift_a.id,
-                ShiftConstraint.linked_shift_id == shift_b.id,
-            )
-        ).first()
+            _CONSTRAINT_BY_PAIR,
+            params={"shift_id": shift_a.id, "linked_shift_id": shift_b.id},
+        ).one_or_none()
         assert constraint_ab.within_last_shifts == 0
 
     def test_generate_from_overlaps_idempotent(self, session: Session, shift_factory):
@@ -677,8 +646,7 @@ class TestShiftConstraintAutoGeneration:
         assert result2["unchanged"] == 2
 
         # Verify still only 2 constraints
-        constraints = session.exec(select(ShiftConstraint)).all()
-        assert len(constraints) == 2
+        assert session.exec(_CONSTRAINT_COUNT).one() == 2
 
     def test_generate_from_overlaps_no_shifts(self, session: Session):
         """Test that method handles empty shift list gracefully."""
@@ -746,36 +714,35 @@ class TestShiftConstraintAutoGeneration:
         assert result["created"] == 1
 
         constraint = session.exec(
-            select(ShiftConstraint).where(
-                ShiftConstraint.shift_id == shift_sunday.id,
-                ShiftConstraint.linked_shift_id == shift_monday.id,
-            )
-        ).first()
+            _CONSTRAINT_BY_PAIR,
+            params={"shift_id": shift_sunday.id, "linked_shift_id": shift_monday.id},
+        ).one_or_none()
         assert constraint is not None
         assert constraint.within_last_shifts == 1
 
     def test_generate_from_overlaps_multiple_overlaps_same_shift(
-        self, session: Session, shift_factory
+        self, session: Session, shift_factory_bulk
     ):
         """Test shift that overlaps with multiple other shifts."""
         # Arrange - Create shift A that overlaps with both B and C
-        _shift_a = shift_factory(
-            seconds_since_midnight=36000,  # 10am
-            duration_seconds=28800,  # 8 hours (10am-6pm)
-            days=["1"],
-            description="Long Shift",
-        )
-        _shift_b = shift_factory(
-            seconds_since_midnight=32400,  # 9am
-            duration_seconds=14400,  # 4 hours (9am-1pm)
-            days=["1"],
-            description="Morning Shift",
-        )
-        _shift_c = shift_factory(
-            seconds_since_midnight=54000,  # 3pm
-            duration_seconds=14400,  # 4 hours (3pm-7pm)
-            days=["1"],
-            description="Afternoon Shift",
+        shift_factory_bulk(
+            [
+                {
+                    "seconds_since_midnight": 36000,  # 10am
+                    "duration_seconds": 28800,  # 8 hours (10am-6pm)
+                    "description": "Long Shift",
+                },
+                {
+                    "seconds_since_midnight": 32400,  # 9am
+                    "duration_seconds": 14400,  # 4 hours (9am-1pm)
+                    "description": "Morning Shift",
+                },
+                {
+                    "seconds_since_midnight": 54000,  # 3pm
+                    "duration_seconds": 14400,  # 4 hours (3pm-7pm)
+                    "description": "Afternoon Shift",
+                },
+            ]
         )
 
         # Act
@@ -810,6 +777,86 @@ class TestShiftConstraintAutoGeneration:
         assert result["created"] == 2
 
         # Verify bidirectional constraints
-        constraints = session.exec(select(ShiftConstraint)).all()
-        assert len(constraints) == 2
-        assert all(c.within_last_shifts == 0 for c in constraints)
+        assert session.exec(_CONSTRAINT_WITHIN_VALUES).all() == [0, 0]
+
+    def test_generate_from_overlaps_same_day_and_cross_day_pair(
+        self, session: Session, shift_factory_bulk
+    ):
+        """Test a pair overlapping both same-day and across midnight gets one row."""
+        # Arrange - Night shift 8pm-8am spills into the long day shift that
+        # starts at 1am, and both also overlap on Monday evening
+        night, day = shift_factory_bulk(
+            [
+                {
+                    "seconds_since_midnight": 72000,  # 8pm
+                    "duration_seconds": 43200,  # 12 hours (8pm-8am)
+                    "days": ["1", "2"],
+                    "description": "Night Shift",
+                },
+                {
+                    "seconds_since_midnight": 3600,  # 1am
+                    "duration_seconds": 79200,  # 22 hours (1am-11pm)
+                    "days": ["1", "2"],
+                    "description": "Long Day Shift",
+                },
+            ]
+        )
+
+        # Act
+        result = ShiftConstraint.generate_from_overlaps(session)
+
+        # Assert - Night -> Day keeps the stricter cross-day value
+        assert result["created"] == 2
+        night_to_day = session.get(ShiftConstraint, (night.id, day.id))
+        day_to_night = session.get(ShiftConstraint, (day.id, night.id))
+        assert night_to_day.within_last_shifts == 1
+        assert day_to_night.within_last_shifts == 0
+
+    def test_generate_from_overlaps_query_count(
+        self, session: Session, shift_factory_bulk, count_queries
+    ):
+        """Test generation costs a fixed number of statements, not one per shift."""
+        # Arrange - Five identical shifts, all overlapping each other
+        shift_factory_bulk([{"duration_seconds": 28800} for _ in range(5)])
+
+        # Act
+        with count_queries() as queries:
+            result = ShiftConstraint.generate_from_overlaps(session)
+
+        # Assert - Shifts, existing constraints, one batched insert
+        assert result["created"] == 20
+        selects = [q for q in queries if q.lstrip().upper().startswith("SELECT")]
+        inserts = [q for q in queries if q.lstrip().upper().startswith("INSERT")]
+        assert len(selects) == 2
+        assert len(inserts) == 1
+
+    def test_generate_from_overlaps_shift_inserted_through_core(
+        self, session: Session, shift_factory
+    ):
+        """Test shifts written without the ORM still have their overlaps detected."""
+        # Arrange - One shift via the ORM, one via a Core INSERT
+        orm_shift = shift_factory(
+            seconds_since_midnight=32400,  # 9am
+            duration_seconds=28800,  # 8 hours
+            days=["1"],
+            description="ORM Shift",
+        )
+        core_shift_id = uuid.uuid4()
+        session.execute(
+            insert(Shift).values(
+                id=core_shift_id,
+                seconds_since_midnight=43200,  # 12pm
+                duration_seconds=28800,  # 8 hours
+                members_required=1,
+                days=["1"],
+                description="Core Shift",
+            )
+        )
+
+        # Act
+        result = ShiftConstraint.generate_from_overlaps(session)
+
+        # Assert
+        assert result["created"] == 2
+        assert session.get(ShiftConstraint, (orm_shift.id, core_shift_id)) is not None
+        assert session.get(ShiftConstraint, (core_shift_id, orm_shift.id)) is not None
@@ -3,13 +3,39 @@ Tests for ShiftScheduled model CRUD operations and relationships.
 """
 
 import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 
 import pytest
+from pydantic import ValidationError
+from sqlalchemy import bindparam, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import Session, select
 
 from models import MemberShiftScheduled, ShiftScheduled
 
+# Times shared by several tests, built once at import
+_JAN_20_9AM = datetime(2025, 1, 20, 9, 0)
+_JAN_20_5PM = datetime(2025, 1, 20, 17, 0)
+
+_SHIFT_SCHEDULED_BY_ID = select(ShiftScheduled).where(
+    ShiftScheduled.id == bindparam("id")
+)
+_LINKS_BY_SHIFT_SCHEDULED = select(MemberShiftScheduled).where(
+    MemberShiftScheduled.shift_scheduled_id == bindparam("shift_scheduled_id")
+)
+_LINKS_BY_MEMBER = select(MemberShiftScheduled).where(
+    MemberShiftScheduled.member_id == bindparam("member_id")
+)
+_SHIFT_SCHEDULED_DESCRIPTIONS = select(ShiftScheduled.description)
+_SHIFT_SCHEDULED_DESCRIPTIONS_STARTING_BETWEEN = _SHIFT_SCHEDULED_DESCRIPTIONS.where(
+    ShiftScheduled.start_at >= bindparam("lo"),
+    ShiftScheduled.start_at < bindparam("hi"),
+)
+_MEMBER_IDS_BY_SHIFT_SCHEDULED = select(MemberShiftScheduled.member_id).where(
+    MemberShiftScheduled.shift_scheduled_id == bindparam("shift_scheduled_id")
+)
+
 
 class TestShiftScheduledCRUD:
     """Test suite for ShiftScheduled Create, Read, Update, Delete operations."""
@@ -29,8 +55,7 @@ class TestShiftScheduledCRUD:
             description="Scheduled instance",
         )
         session.add(scheduled)
-        session.commit()
-        session.refresh(scheduled)
+        session.flush()
 
         # Assert
         assert scheduled.id is not None
@@ -64,8 +89,9 @@ class TestShiftScheduledCRUD:
         created = shift_scheduled_factory(description="Test scheduled shift")
 
         # Act
-        statement = select(ShiftScheduled).where(ShiftScheduled.id == created.id)
-        result = session.exec(statement).first()
+        result = session.exec(
+            _SHIFT_SCHEDULED_BY_ID, params={"id": created.id}
+        ).one_or_none()
 
         # Assert
         assert result is not None
@@ -74,21 +100,21 @@ class TestShiftScheduledCRUD:
         assert result.end_at == created.end_at
         assert result.shift_id == created.shift_id
 
-    def test_read_all_shift_scheduled(self, session: Session, shift_scheduled_factory):
+    def test_read_all_shift_scheduled(
+        self, session: Session, shift_scheduled_factory_bulk
+    ):
         """Test reading multiple scheduled shifts."""
         # Arrange
-        shift_scheduled_factory(description="Shift 1")
-        shift_scheduled_factory(description="Shift 2")
-        shift_scheduled_factory(description="Shift 3")
+        shift_scheduled_factory_bulk(
+            [{"description": f"Shift {i}"} for i in range(1, 4)]
+        )
 
         # Act
-        statement = select(ShiftScheduled)
-        results = session.exec(statement).all()
+        descriptions = session.exec(_SHIFT_SCHEDULED_DESCRIPTIONS).all()
 
         # Assert
-        assert len(results) == 3
-        descriptions = {s.description for s in results}
-        assert descriptions == {"Shift 1", "Shift 2", "Shift 3"}
+        assert len(descriptions) == 3
+        assert set(descriptions) == {"Shift 1", "Shift 2", "Shift 3"}
 
     def test_update_shift_scheduled(self, session: Session, shift_scheduled_factory):
         """Test updating a scheduled shift's information."""
@@ -103,8 +129,7 @@ class TestShiftScheduledCRUD:
         scheduled.end_at = new_end
         scheduled.description = "Updated"
         session.add(scheduled)
-        session.commit()
-        session.refresh(scheduled)
+        session.flush()
 
         # Assert
         assert scheduled.id == original_id
@@ -120,11 +145,10 @@ class TestShiftScheduledCRUD:
 
         # Act
         session.delete(scheduled)
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(ShiftScheduled).where(ShiftScheduled.id == scheduled_id)
-        result = session.exec(statement).first()
+        result = session.get(ShiftScheduled, scheduled_id)
         assert result is None
 
 
@@ -132,7 +156,7 @@ class TestShiftScheduledRelationships:
     """Test suite for ShiftScheduled relationships."""
 
     def test_shift_scheduled_belongs_to_shift(
-        self, session: Session, shift_factory, shift_scheduled_factory
+        self, session: Session, shift_factory, shift_scheduled_factory, no_lazy_loads
     ):
         """Test that a scheduled shift is linked to a shift template."""
         # Arrange
@@ -141,13 +165,15 @@ class TestShiftScheduledRelationships:
             shift_id=shift_template.id, description="Instance"
         )
 
-        # Act
-        statement = select(ShiftScheduled).where(ShiftScheduled.id == scheduled.id)
-        result = session.exec(statement).first()
+        # Act - The shift comes back in the same SELECT via a JOIN
+        statement = _SHIFT_SCHEDULED_BY_ID.options(joinedload(ShiftScheduled.shift))
+        result = session.exec(statement, params={"id": scheduled.id}).one_or_none()
 
         # Assert
         assert result is not None
-        assert result.shift_id == shift_template.id
+        with no_lazy_loads():
+            assert result.shift_id == shift_template.id
+            assert result.shift.description == "Template"
 
 
 class TestShiftScheduledMemberAssignment:
@@ -166,46 +192,60 @@ class TestShiftScheduledMemberAssignment:
             member_id=member.id, shift_scheduled_id=scheduled.id
         )
         session.add(link)
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.shift_scheduled_id == scheduled.id
-        )
-        results = session.exec(statement).all()
+        results = session.exec(
+            _LINKS_BY_SHIFT_SCHEDULED, params={"shift_scheduled_id": scheduled.id}
+        ).all()
         assert len(results) == 1
         assert results[0].member_id == member.id
 
     def test_assign_multiple_members_to_shift(
-        self, session: Session, member_factory, shift_scheduled_factory
+        self,
+        session: Session,
+        member_group_factory,
+        member_factory,
+        shift_scheduled_factory,
+        no_lazy_loads,
     ):
         """Test assigning multiple members to the same scheduled shift."""
         # Arrange
-        member1 = member_factory(name="Member 1", email="m1@example.com")
-        member2 = member_factory(name="Member 2", email="m2@example.com")
-        member3 = member_factory(name="Member 3", email="m3@example.com")
+        group = member_group_factory(name="Team")
+        member1, member2, member3 = (
+            member_factory(
+                name=f"Member {i}", email=f"m{i}@example.com", member_group_id=group.id
+            )
+            for i in range(1, 4)
+        )
         scheduled = shift_scheduled_factory(description="Team Shift")
 
         # Act
-        session.add(
-            MemberShiftScheduled(member_id=member1.id, shift_scheduled_id=scheduled.id)
-        )
-        session.add(
-            MemberShiftScheduled(member_id=member2.id, shift_scheduled_id=scheduled.id)
+        session.execute(
+            insert(MemberShiftScheduled),
+            [
+                {"member_id": member.id, "shift_scheduled_id": scheduled.id}
+                for member in (member1, member2, member3)
+            ],
         )
-        session.add(
-            MemberShiftScheduled(member_id=member3.id, shift_scheduled_id=scheduled.id)
-        )
-        session.commit()
 
         # Assert
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.shift_scheduled_id == scheduled.id
-        )
-        results = session.exec(statement).all()
-        assert len(results) == 3
-        assigned_member_ids = {link.member_id for link in results}
-        assert assigned_member_ids == {member1.id, member2.id, member3.id}
+        assigned_member_ids = session.exec(
+            _MEMBER_IDS_BY_SHIFT_SCHEDULED,
+            params={"shift_scheduled_id": scheduled.id},
+        ).all()
+        assert len(assigned_member_ids) == 3
+        assert set(assigned_member_ids) == {member1.id, member2.id, member3.id}
+
+        # Members load in one batched SELECT rather than one per link
+        statement = _SHIFT_SCHEDULED_BY_ID.options(selectinload(ShiftScheduled.members))
+        result = session.exec(statement, params={"id": scheduled.id}).one()
+        with no_lazy_loads():
+            assert {m.name for m in result.members} == {
+                "Member 1",
+                "Member 2",
+                "Member 3",
+            }
 
     def test_member_assigned_to_multiple_shifts(
         self, session: Session, member_factory, shift_scheduled_factory
@@ -218,22 +258,16 @@ class TestShiftScheduledMemberAssignment:
         shift3 = shift_scheduled_factory(description="Evening")
 
         # Act
-        session.add(
-            MemberShiftScheduled(member_id=member.id, shift_scheduled_id=shift1.id)
-        )
-        session.add(
-            MemberShiftScheduled(member_id=member.id, shift_scheduled_id=shift2.id)
-        )
-        session.add(
-            MemberShiftScheduled(member_id=member.id, shift_scheduled_id=shift3.id)
+        session.execute(
+            insert(MemberShiftScheduled),
+            [
+                {"member_id": member.id, "shift_scheduled_id": shift.id}
+                for shift in (shift1, shift2, shift3)
+            ],
         )
-        session.commit()
 
         # Assert
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == member.id
-        )
-        results = session.exec(statement).all()
+        results = session.exec(_LINKS_BY_MEMBER, params={"member_id": member.id}).all()
         assert len(results) == 3
 
     def test_unassign_member_from_shift(
@@ -247,131 +281,124 @@ class TestShiftScheduledMemberAssignment:
             member_id=member.id, shift_scheduled_id=scheduled.id
         )
         session.add(link)
-        session.commit()
+        session.flush()
 
         # Act
         session.delete(link)
-        session.commit()
+        session.flush()
 
         # Assert
-        statement = select(MemberShiftScheduled).where(
-            MemberShiftScheduled.member_id == member.id,
-            MemberShiftScheduled.shift_scheduled_id == scheduled.id,
-        )
-        result = session.exec(statement).first()
+        result = session.get(MemberShiftScheduled, (member.id, scheduled.id))
         assert result is None
 
 
 class TestShiftScheduledConstraints:
     """Test suite for ShiftScheduled validation and constraints."""
 
-    def test_shift_scheduled_requires_start_at(self, session: Session, shift_factory):
-        """Test that a scheduled shift requires a start time."""
-        shift = shift_factory()
-        end = datetime.now(timezone.utc) + timedelta(hours=8)
-
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(ShiftScheduled(end_at=end, shift_id=shift.id))
-            session.commit()
-
-    def test_shift_scheduled_requires_end_at(self, session: Session, shift_factory):
-        """Test that a scheduled shift requires an end time."""
-        shift = shift_factory()
-        start = datetime.now(timezone.utc)
-
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(ShiftScheduled(start_at=start, shift_id=shift.id))
-            session.commit()
-
-    def test_shift_scheduled_requires_shift_id(self, session: Session):
-        """Test that a scheduled shift requires a shift_id."""
-        start = datetime.now(timezone.utc)
-        end = start + timedelta(hours=8)
-
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            session.add(ShiftScheduled(start_at=start, end_at=end))
-            session.commit()
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param(
+                {"end_at": _JAN_20_5PM, "shift_id": uuid.uuid4()},
+                id="requires_start_at",
+            ),
+            pytest.param(
+                {"start_at": _JAN_20_9AM, "shift_id": uuid.uuid4()},
+                id="requires_end_at",
+            ),
+            pytest.param(
+                {"start_at": _JAN_20_9AM, "end_at": _JAN_20_5PM},
+                id="requires_shift_id",
+            ),
+        ],
+    )
+    def test_shift_scheduled_missing_field(self, data: dict):
+        """Test that validating a scheduled shift without a required field fails."""
+        with pytest.raises(ValidationError):
+            ShiftScheduled.model_validate(data)
 
     def test_shift_scheduled_foreign_key_constraint(self, session: Session):
         """Test that shift_id must reference an existing shift."""
-        non_existent_shift_id = uuid.uuid4()
-        start = datetime.now(timezone.utc)
-        end = start + timedelta(hours=8)
-
         scheduled = ShiftScheduled(
-            start_at=start, end_at=end, shift_id=non_existent_shift_id
+            start_at=_JAN_20_9AM, end_at=_JAN_20_5PM, shift_id=uuid.uuid4()
         )
         session.add(scheduled)
-        with pytest.raises(Exception):  # Foreign key constraint
-            session.commit()
+        with pytest.raises(IntegrityError):  # Foreign key constraint
+            session.flush()
+        session.rollback()
 
 
 class TestShiftScheduledQueryPatterns:
     """Test suite for common ShiftScheduled query patterns."""
 
     def test_query_shifts_by_date_range(
-        self, session: Session, shift_scheduled_factory
+        self, session: Session, shift_scheduled_factory_bulk
     ):
         """Test querying scheduled shifts within a date range."""
         # Arrange
-        shift_scheduled_factory(
-            start_at=datetime(2025, 1, 20, 9, 0),
-            end_at=datetime(2025, 1, 20, 17, 0),
-            description="Jan 20",
-        )
-        shift_scheduled_factory(
-            start_at=datetime(2025, 1, 25, 9, 0),
-            end_at=datetime(2025, 1, 25, 17, 0),
-            description="Jan 25",
-        )
-        shift_scheduled_factory(
-            start_at=datetime(2025, 2, 1, 9, 0),
-            end_at=datetime(2025, 2, 1, 17, 0),
-            description="Feb 1",
+        shift_scheduled_factory_bulk(
+            [
+                {
+                    "start_at": datetime(2025, 1, 20, 9, 0),
+                    "end_at": datetime(2025, 1, 20, 17, 0),
+                    "description": "Jan 20",
+                },
+                {
+                    "start_at": datetime(2025, 1, 25, 9, 0),
+                    "end_at": datetime(2025, 1, 25, 17, 0),
+                    "description": "Jan 25",
+                },
+                {
+                    "start_at": datetime(2025, 2, 1, 9, 0),
+                    "end_at": datetime(2025, 2, 1, 17, 0),
+                    "description": "Feb 1",
+                },
+            ]
         )
 
         # Act - Query shifts in January
-        statement = select(ShiftScheduled).where(
-            ShiftScheduled.start_at >= datetime(2025, 1, 1),
-            ShiftScheduled.start_at < datetime(2025, 2, 1),
-        )
-        results = session.exec(statement).all()
+        descriptions = session.exec(
+            _SHIFT_SCHEDULED_DESCRIPTIONS_STARTING_BETWEEN,
+            params={"lo": datetime(2025, 1, 1), "hi": datetime(2025, 2, 1)},
+        ).all()
 
         # Assert
-        assert len(results) == 2
-        descriptions = {s.description for s in results}
-        assert descriptions == {"Jan 20", "Jan 25"}
+        assert len(descriptions) == 2
+        assert set(descriptions) == {"Jan 20", "Jan 25"}
 
     def test_query_shifts_by_specific_date(
-        self, session: Session, shift_scheduled_factory
+        self, session: Session, shift_scheduled_factory_bulk
     ):
         """Test querying scheduled shifts on a specific date."""
         # Arrange
         target_date = datetime(2025, 1, 20)
-        shift_scheduled_factory(
-            start_at=datetime(2025, 1, 20, 9, 0),
-            end_at=datetime(2025, 1, 20, 17, 0),
-            description="Target day morning",
-        )
-        shift_scheduled_factory(
-            start_at=datetime(2025, 1, 20, 18, 0),
-            end_at=datetime(2025, 1, 20, 23, 0),
-            description="Target day evening",
-        )
-        shift_scheduled_factory(
-            start_at=datetime(2025, 1, 21, 9, 0),
-            end_at=datetime(2025, 1, 21, 17, 0),
-            description="Different day",
+        shift_scheduled_factory_bulk(
+            [
+                {
+                    "start_at": datetime(2025, 1, 20, 9, 0),
+                    "end_at": datetime(2025, 1, 20, 17, 0),
+                    "description": "Target day morning",
+                },
+                {
+                    "start_at": datetime(2025, 1, 20, 18, 0),
+                    "end_at": datetime(2025, 1, 20, 23, 0),
+                    "description": "Target day evening",
+                },
+                {
+                    "start_at": datetime(2025, 1, 21, 9, 0),
+                    "end_at": datetime(2025, 1, 21, 17, 0),
+                    "description": "Different day",
+                },
+            ]
         )
 
         # Act
         next_day = target_date + timedelta(days=1)
-        statement = select(ShiftScheduled).where(
-            ShiftScheduled.start_at >= target_date, ShiftScheduled.start_at < next_day
-        )
-        results = session.exec(statement).all()
+        descriptions = session.exec(
+            _SHIFT_SCHEDULED_DESCRIPTIONS_STARTING_BETWEEN,
+            params={"lo": target_date, "hi": next_day},
+        ).all()
 
         # Assert
-        assert len(results) == 2
-        descriptions = {s.description for s in results}
-        assert descriptions == {"Target day morning", "Target day evening"}
+        assert len(descriptions) == 2
+        assert set(descriptions) == {"Target day morning", "Target day evening"}